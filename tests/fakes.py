@@ -0,0 +1,106 @@
+from contextlib import asynccontextmanager
+from logging import getLogger
+
+import pytest
+
+from utils.cache import (
+    in_memory_cache_manager,
+    InMemoryCacheManager,
+)
+from utils.database.asyncpg.db_action_with_cache import DbActionWithCache
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    async def start(self):
+        return None
+
+    async def commit(self):
+        return None
+
+    async def rollback(self):
+        return None
+
+
+class FakeConnection:
+    # Records every statement; answers come from the `rows` and `row` the test
+    # sets up.
+    def __init__(self, rows=(), row=None):
+        self.rows = list(rows)
+        self.row = row
+        self.queries = list()
+
+    async def fetch(self, query, *values):
+        self.queries.append((query, values))
+        return list(self.rows)
+
+    async def fetchrow(self, query, *values):
+        self.queries.append((query, values))
+        return self.row
+
+    async def fetchval(self, query, *values):
+        self.queries.append((query, values))
+        return self.row
+
+    async def execute(self, query, *values):
+        self.queries.append((query, values))
+        return "OK"
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def cursor(self, query, *values, prefetch=None):
+        self.queries.append((query, values))
+        for row in self.rows:
+            yield row
+
+
+class FakePool:
+    def __init__(self, connection=None):
+        self.connection = connection or FakeConnection()
+        self.acquired = 0
+        self.released = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        try:
+            yield self.connection
+        finally:
+            self.released += 1
+
+
+class FakeClock:
+    # Stands in for time.monotonic; tests move `now` by hand.
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(in_memory_cache_manager, "monotonic", clock)
+    return clock
+
+
+def create_db_action_with_cache(**kwargs) -> DbActionWithCache:
+    return DbActionWithCache(
+        table_name="item",
+        all_columns_names={"pid", "name"},
+        cache_manager=InMemoryCacheManager(logger=getLogger(__name__), name="test"),
+        **kwargs,
+    )
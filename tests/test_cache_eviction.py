@@ -0,0 +1,151 @@
+from logging import getLogger
+
+import pytest
+
+from utils.cache import (
+    EnumEvictionPolicy,
+    InMemoryCacheManager,
+)
+from utils.cache.eviction_policy import (
+    CountMinSketch,
+    LfuEvictionPolicy,
+)
+
+
+def create_cache_manager(**kwargs) -> InMemoryCacheManager:
+    return InMemoryCacheManager(logger=getLogger(__name__), name="test", **kwargs)
+
+
+def fetch(cache_manager: InMemoryCacheManager, key: str):
+    return cache_manager.fetch_from_cache_without_expiration_check(key=key)
+
+
+def insert(cache_manager: InMemoryCacheManager, key: str, value="value") -> None:
+    cache_manager.insert_in_cache_without_expiration(key=key, value=value)
+
+
+def test_unbounded_cache_keeps_everything():
+    cache_manager = create_cache_manager()
+    for index in range(100):
+        insert(cache_manager, f"k{index}")
+
+    assert len(cache_manager.cache) == 100
+    assert cache_manager.eviction_policy is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache_manager = create_cache_manager(maximum_entries=2)
+    insert(cache_manager, "a")
+    insert(cache_manager, "b")
+    fetch(cache_manager, "a")
+    insert(cache_manager, "c")
+
+    assert set(cache_manager.cache) == {"a", "c"}
+    assert cache_manager.info()["evictions"] == 1
+
+
+def test_replacing_a_key_does_not_evict():
+    cache_manager = create_cache_manager(maximum_entries=2)
+    insert(cache_manager, "a")
+    insert(cache_manager, "b")
+    insert(cache_manager, "a", value="new")
+
+    assert set(cache_manager.cache) == {"a", "b"}
+    assert fetch(cache_manager, "a") == "new"
+    assert cache_manager.evictions == 0
+
+
+def test_lfu_evicts_least_frequently_used_oldest_first():
+    cache_manager = create_cache_manager(maximum_entries=3, eviction_policy=EnumEvictionPolicy.LFU)
+    for key in ("a", "b", "c"):
+        insert(cache_manager, key)
+    fetch(cache_manager, "a")
+    fetch(cache_manager, "a")
+    fetch(cache_manager, "c")
+
+    insert(cache_manager, "d")
+    assert set(cache_manager.cache) == {"a", "c", "d"}
+
+    insert(cache_manager, "e")
+    assert set(cache_manager.cache) == {"a", "c", "e"}
+
+
+def test_lfu_policy_tracks_minimum_frequency_on_remove():
+    policy = LfuEvictionPolicy()
+    policy.on_insert("a")
+    policy.on_insert("b")
+    policy.on_access("b")
+    policy.on_remove("a")
+
+    assert policy.minimum_frequency == 2
+    assert list(policy.victims()) == ["b"]
+
+
+def test_tiny_lfu_rejects_one_off_key_in_favour_of_hot_entry():
+    cache_manager = create_cache_manager(maximum_entries=1, eviction_policy=EnumEvictionPolicy.TINY_LFU)
+    insert(cache_manager, "hot")
+    for _ in range(5):
+        fetch(cache_manager, "hot")
+
+    insert(cache_manager, "cold")
+
+    assert set(cache_manager.cache) == {"hot"}
+    assert cache_manager.info()["rejections"] == 1
+
+
+def test_tiny_lfu_admits_key_that_is_read_as_often():
+    cache_manager = create_cache_manager(maximum_entries=1, eviction_policy=EnumEvictionPolicy.TINY_LFU)
+    insert(cache_manager, "old")
+    fetch(cache_manager, "old")
+    # Misses count too: a key that keeps being asked for earns its slot.
+    fetch(cache_manager, "new")
+    fetch(cache_manager, "new")
+
+    insert(cache_manager, "new")
+
+    assert set(cache_manager.cache) == {"new"}
+
+
+def test_size_limit_evicts_until_it_fits():
+    cache_manager = create_cache_manager(maximum_size_in_bytes=300)
+    insert(cache_manager, "a", value="x" * 100)
+    insert(cache_manager, "b", value="x" * 100)
+    insert(cache_manager, "c", value="x" * 100)
+
+    assert set(cache_manager.cache) == {"b", "c"}
+    assert cache_manager.size_in_bytes == sum(cache_manager.sizes.values())
+    assert cache_manager.size_in_bytes <= 300
+
+
+def test_oversized_value_is_rejected_and_drops_previous_value():
+    cache_manager = create_cache_manager(maximum_size_in_bytes=200)
+    insert(cache_manager, "a", value="small")
+    insert(cache_manager, "a", value="x" * 1000)
+
+    assert fetch(cache_manager, "a") is None
+    assert cache_manager.size_in_bytes == 0
+    assert cache_manager.rejections == 1
+
+
+@pytest.mark.parametrize("eviction_policy", list(EnumEvictionPolicy))
+def test_clear_cache_resets_bookkeeping(eviction_policy):
+    cache_manager = create_cache_manager(maximum_entries=2, eviction_policy=eviction_policy)
+    insert(cache_manager, "a")
+    insert(cache_manager, "b")
+    cache_manager.clear_cache()
+
+    insert(cache_manager, "c")
+    insert(cache_manager, "d")
+    assert set(cache_manager.cache) == {"c", "d"}
+    assert cache_manager.size_in_bytes == 0
+
+
+def test_count_min_sketch_saturates_and_ages():
+    sketch = CountMinSketch(width=16)
+    for _ in range(20):
+        sketch.increment("a")
+    assert sketch.estimate("a") == 15
+
+    for index in range(sketch.sample_size):
+        sketch.increment(f"other{index}")
+    assert sketch.estimate("a") < 15
@@ -0,0 +1,83 @@
+from logging import getLogger
+
+import pytest
+
+from utils.cache import InMemoryCacheManager
+
+from .fakes import clock
+
+
+@pytest.fixture
+def cache_manager() -> InMemoryCacheManager:
+    return InMemoryCacheManager(logger=getLogger(__name__), name="test", maximum_ttl_in_seconds=10)
+
+
+def test_entry_expires_after_its_ttl(clock, cache_manager):
+    cache_manager.insert_in_cache_with_expiration(key="a", value="value", ttl_in_seconds=5)
+
+    clock.now += 4.9
+    assert cache_manager.fetch_from_cache_with_expiration_check(key="a") == "value"
+
+    clock.now += 0.1
+    assert cache_manager.fetch_from_cache_with_expiration_check(key="a") is None
+    assert "a" not in cache_manager.cache
+
+
+def test_default_ttl_is_maximum_ttl(clock, cache_manager):
+    cache_manager.insert_in_cache_with_expiration(key="a", value="value")
+
+    assert cache_manager.cache["a"][0] == clock.now + 10
+
+
+def test_cron_removes_only_due_entries(clock, cache_manager):
+    cache_manager.insert_in_cache_with_expiration(key="soon", value=1, ttl_in_seconds=1)
+    cache_manager.insert_in_cache_with_expiration(key="later", value=2, ttl_in_seconds=100)
+    cache_manager.insert_in_cache_without_expiration(key="never", value=3)
+
+    clock.now += 2
+    cache_manager.clean_expired_items_cron_func()
+
+    assert set(cache_manager.cache) == {"later", "never"}
+    assert cache_manager.expiry_heap == [(1100.0, "later")]
+
+
+def test_cron_removes_entries_due_within_the_next_period(clock):
+    cache_manager = InMemoryCacheManager(
+        logger=getLogger(__name__),
+        name="test",
+        clean_up_period_in_seconds=60,
+    )
+    cache_manager.insert_in_cache_with_expiration(key="a", value=1, ttl_in_seconds=30)
+    cache_manager.insert_in_cache_with_expiration(key="b", value=2, ttl_in_seconds=90)
+
+    cache_manager.clean_expired_items_cron_func()
+
+    assert set(cache_manager.cache) == {"b"}
+
+
+def test_replaced_entry_is_not_removed_by_its_old_expiry(clock, cache_manager):
+    cache_manager.insert_in_cache_with_expiration(key="a", value="old", ttl_in_seconds=1)
+    cache_manager.insert_in_cache_with_expiration(key="a", value="new", ttl_in_seconds=100)
+
+    clock.now += 2
+    assert cache_manager._remove_expired(criteria=clock.now) == 0
+    assert cache_manager.fetch_from_cache_with_expiration_check(key="a") == "new"
+
+
+def test_entry_made_permanent_is_not_expired(clock, cache_manager):
+    cache_manager.insert_in_cache_with_expiration(key="a", value="old", ttl_in_seconds=1)
+    cache_manager.insert_in_cache_without_expiration(key="a", value="new")
+
+    clock.now += 2
+    cache_manager.clean_expired_items_cron_func()
+
+    assert cache_manager.fetch_from_cache_with_expiration_check(key="a") == "new"
+
+
+def test_stale_heap_items_are_compacted(clock, cache_manager):
+    for _ in range(1100):
+        cache_manager.insert_in_cache_with_expiration(key="a", value="value", ttl_in_seconds=5)
+
+    assert len(cache_manager.expiry_heap) <= 2 * len(cache_manager.cache) + 1024
+    assert (clock.now + 5, "a") in cache_manager.expiry_heap
+
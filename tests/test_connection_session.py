@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from utils.database.asyncpg.connection_session import ConnectionSession
+from utils.database.asyncpg.db_action import DbAction
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+    FakeTransaction,
+)
+
+
+def create_db_action() -> DbAction:
+    return DbAction(
+        table_name="item",
+        all_columns_names={"pid", "name"},
+    )
+
+
+def test_nested_call_inside_stream_does_not_deadlock():
+    db_action = create_db_action()
+    connection = FakeConnection(
+        rows=[{"pid": 1}, {"pid": 2}],
+        row={"flag": True},
+    )
+
+    async def run():
+        results = list()
+        async with db_action.session(FakePool(connection)) as session:
+            async for record in db_action.iter_many(
+                where_clause="TRUE",
+                values=(),
+                postgresql_connection_pool=session,
+                returning_fields={"pid"},
+            ):
+                results.append(
+                    await db_action.is_exist(
+                        where_clause="pid = $1",
+                        values=(record["pid"],),
+                        postgresql_connection_pool=session,
+                    )
+                )
+        return results
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=1)) == [True, True]
+
+
+def test_nested_acquire_in_owner_task_is_reentrant():
+    async def run():
+        async with ConnectionSession(FakePool()) as session:
+            async with session.acquire() as outer:
+                async with session.acquire() as inner:
+                    assert inner is outer
+                assert session._owner is asyncio.current_task()
+            assert session._owner is None
+
+    asyncio.run(asyncio.wait_for(run(), timeout=1))
+
+
+def test_other_tasks_still_wait_for_the_owner():
+    events = list()
+
+    async def run():
+        async with ConnectionSession(FakePool()) as session:
+            async def other():
+                async with session.acquire():
+                    events.append("other")
+
+            async with session.acquire():
+                task = asyncio.create_task(other())
+                await asyncio.sleep(0.01)
+                events.append("owner")
+            await task
+
+    asyncio.run(asyncio.wait_for(run(), timeout=1))
+    assert events == ["owner", "other"]
+
+
+class BrokenTransaction(FakeTransaction):
+    async def start(self):
+        raise ConnectionError("connection was closed")
+
+
+class BrokenTransactionConnection(FakeConnection):
+    def transaction(self):
+        return BrokenTransaction()
+
+
+def test_failed_transaction_start_releases_the_connection():
+    pool = FakePool(BrokenTransactionConnection())
+    session = ConnectionSession(postgresql_connection_pool=pool, with_transact=True)
+
+    async def run():
+        async with session:
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+
+    assert pool.acquired == pool.released == 1
+    assert session.connection is None
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+    UTC,
+)
+
+import pytest
+
+from utils.database.asyncpg.db_action import DbAction
+from utils.database.constant import EnumDatetimeDuration
+from utils.database.datetime_bucket import (
+    fill_datetime_buckets,
+    next_datetime_bucket,
+    to_naive_utc,
+    truncate_datetime,
+)
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+
+def fetch_report(column_type: str, rows: list[dict]) -> tuple[list[dict], FakeConnection]:
+    db_action = DbAction(
+        table_name="item",
+        all_columns_names={"pid", "created_at"},
+        columns_types={"created_at": column_type},
+    )
+    connection = FakeConnection(rows=rows)
+    report = asyncio.run(
+        db_action.fetch_report_on_datetime_fields(
+            postgresql_connection_pool=FakePool(connection),
+            duration=EnumDatetimeDuration.DAILY,
+            field_name="created_at",
+            from_datetime=datetime(2024, 1, 1, tzinfo=UTC),
+            to_datetime=datetime(2024, 1, 3, tzinfo=UTC),
+        )
+    )
+    return report, connection
+
+
+def test_report_on_timestamp_without_time_zone_column():
+    report, connection = fetch_report(
+        column_type="timestamp without time zone",
+        rows=[{"period": datetime(2024, 1, 2), "count": 5}],
+    )
+
+    assert report == [
+        {"datetime": "2024-01-01", "count": 0},
+        {"datetime": "2024-01-02", "count": 5},
+    ]
+    query, values = connection.queries[-1]
+    assert "DATE_TRUNC('day', created_at)" in query
+    assert values == (datetime(2024, 1, 1), datetime(2024, 1, 3))
+
+
+def test_report_on_timestamp_with_time_zone_column():
+    report, connection = fetch_report(
+        column_type="timestamp with time zone",
+        rows=[{"period": datetime(2024, 1, 2), "count": 5}],
+    )
+
+    assert report == [
+        {"datetime": "2024-01-01", "count": 0},
+        {"datetime": "2024-01-02", "count": 5},
+    ]
+    query, values = connection.queries[-1]
+    assert "DATE_TRUNC('day', created_at AT TIME ZONE 'UTC')" in query
+    assert all(value.tzinfo is not None for value in values)
+
+
+def test_report_matches_aware_periods():
+    report, _ = fetch_report(
+        column_type="timestamp without time zone",
+        rows=[{"period": datetime(2024, 1, 1, tzinfo=UTC), "count": 3}],
+    )
+
+    assert report[0] == {"datetime": "2024-01-01", "count": 3}
+
+
+def test_to_naive_utc():
+    tehran = timezone(timedelta(hours=3, minutes=30))
+    assert to_naive_utc(datetime(2024, 1, 1, 3, 30, tzinfo=tehran)) == datetime(2024, 1, 1)
+    assert to_naive_utc(datetime(2024, 1, 1, 5)) == datetime(2024, 1, 1, 5)
+
+
+@pytest.mark.parametrize(
+    ("trunc_value", "expected"),
+    [
+        ("hour", datetime(2024, 5, 15, 13)),
+        ("day", datetime(2024, 5, 15)),
+        ("week", datetime(2024, 5, 13)),
+        ("month", datetime(2024, 5, 1)),
+        ("year", datetime(2024, 1, 1)),
+    ],
+)
+def test_truncate_datetime(trunc_value, expected):
+    assert truncate_datetime(datetime(2024, 5, 15, 13, 45, 10), trunc_value) == expected
+
+
+def test_next_datetime_bucket_rolls_over_the_year():
+    assert next_datetime_bucket(datetime(2024, 12, 1), "month") == datetime(2025, 1, 1)
+    assert next_datetime_bucket(datetime(2024, 1, 1), "year") == datetime(2025, 1, 1)
+    assert next_datetime_bucket(datetime(2024, 1, 1, 23), "hour") == datetime(2024, 1, 2)
+
+
+def test_fill_datetime_buckets_treats_to_datetime_as_exclusive():
+    results = fill_datetime_buckets(
+        counts={datetime(2024, 1, 1, 1): 2},
+        trunc_value="hour",
+        date_format="%H",
+        from_datetime=datetime(2024, 1, 1),
+        to_datetime=datetime(2024, 1, 1, 3),
+    )
+
+    assert results == [
+        {"datetime": "00", "count": 0},
+        {"datetime": "01", "count": 2},
+        {"datetime": "02", "count": 0},
+    ]
+
+
+def test_fill_datetime_buckets_without_bounds_or_counts():
+    assert fill_datetime_buckets(counts={}, trunc_value="day", date_format="%d") == list()
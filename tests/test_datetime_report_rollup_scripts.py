@@ -0,0 +1,59 @@
+from utils.database import add_datetime_report_rollup_scripts
+from utils.database.sql_statements import split_sql_statements
+
+
+def compile_scripts(**kwargs) -> dict[str, list]:
+    compiled_scripts = dict()
+    add_datetime_report_rollup_scripts(
+        table_name="item",
+        field_name="created_at",
+        compiled_scripts=compiled_scripts,
+        **kwargs,
+    )
+    return compiled_scripts
+
+
+def find_statement(statements: list[str], start: str) -> str:
+    (statement,) = [statement for statement in statements if statement.startswith(start)]
+    return statement
+
+
+def test_update_trigger_only_fires_when_the_day_changes():
+    statements = split_sql_statements(compile_scripts()["functions_and_triggers"][0])
+    update_trigger = find_statement(statements, "CREATE TRIGGER item_created_at_daily_count_trigger_update")
+
+    assert "AFTER UPDATE OF created_at ON item" in update_trigger
+    assert "FOR EACH ROW" in update_trigger
+    assert "REFERENCING" not in update_trigger
+    assert (
+        "WHEN (DATE_TRUNC('day', OLD.created_at AT TIME ZONE 'UTC') IS DISTINCT FROM "
+        "DATE_TRUNC('day', NEW.created_at AT TIME ZONE 'UTC'))"
+    ) in update_trigger
+
+
+def test_rollup_rows_are_sharded():
+    compiled_scripts = compile_scripts(shard_count=4)
+
+    assert "PRIMARY KEY (bucket, shard)" in compiled_scripts["tables"][0]
+    assert "pg_backend_pid() % 4" in compiled_scripts["functions_and_triggers"][0]
+    assert "ON CONFLICT (bucket, shard)" in compiled_scripts["functions_and_triggers"][0]
+
+
+def test_naive_field_is_bucketed_without_conversion():
+    script = compile_scripts(is_naive_field=True)["functions_and_triggers"][0]
+
+    assert "AT TIME ZONE" not in script
+    assert "DATE_TRUNC('day', created_at)" in script
+
+
+def test_truncate_empties_the_rollup():
+    statements = split_sql_statements(compile_scripts()["functions_and_triggers"][0])
+    truncate_trigger = find_statement(statements, "CREATE TRIGGER item_created_at_daily_count_trigger_truncate")
+    truncate_function = find_statement(
+        statements,
+        "CREATE OR REPLACE FUNCTION item_created_at_daily_count_refresh_truncate()",
+    )
+
+    assert "AFTER TRUNCATE ON item" in truncate_trigger
+    assert "FOR EACH STATEMENT EXECUTE FUNCTION item_created_at_daily_count_refresh_truncate()" in truncate_trigger
+    assert "TRUNCATE item_created_at_daily_count;" in truncate_function
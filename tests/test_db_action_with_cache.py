@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from utils.database.asyncpg.db_action_with_cache import DbActionWithCache
+from utils.database.asyncpg.routed_pool import RoutedPool
+
+from .fakes import (
+    create_db_action_with_cache,
+    FakeConnection,
+    FakePool,
+)
+
+
+@pytest.fixture
+def db_action() -> DbActionWithCache:
+    return create_db_action_with_cache()
+
+
+@pytest.mark.parametrize(
+    ("where_clause", "values", "expected"),
+    [
+        ("pid = $1", ("a",), "a"),
+        (" item.PID = $2 ;", ("x", "b"), "b"),
+        ("pid = 'c'", (), "c"),
+        ("pid = $2", ("a",), None),
+        ("pid = $1 AND name = $2", ("a", "n"), None),
+        ("name = $1", ("n",), None),
+    ],
+)
+def test_derive_pid(where_clause, values, expected):
+    assert DbActionWithCache._derive_pid(where_clause=where_clause, values=values) == expected
+
+
+def test_entries_are_tagged_by_table_and_pid_or_list(db_action):
+    connection = FakeConnection(rows=[{"pid": "a"}], row={"pid": "a"})
+    pool = FakePool(connection)
+
+    async def main():
+        await db_action.fetch(
+            where_clause="pid = $1",
+            values=("a",),
+            postgresql_connection_pool=pool,
+            returning_fields={"pid"},
+        )
+        await db_action.fetch_many(
+            where_clause="name = $1",
+            values=("n",),
+            postgresql_connection_pool=pool,
+            returning_fields={"pid"},
+        )
+
+    asyncio.run(main())
+
+    assert set(db_action.cache_manager.tags) == {"item", "item:pid:a", "item:list"}
+    assert len(db_action.cache_manager.tags["item"]) == 2
+
+
+def fill_cache(db_action: DbActionWithCache, pool: FakePool) -> set[str]:
+    async def main():
+        for pid in ("a", "b"):
+            await db_action.fetch(
+                where_clause="pid = $1",
+                values=(pid,),
+                postgresql_connection_pool=pool,
+                returning_fields={"pid"},
+            )
+        await db_action.fetch_many(
+            where_clause="name = $1",
+            values=("n",),
+            postgresql_connection_pool=pool,
+            returning_fields={"pid"},
+        )
+
+    asyncio.run(main())
+    return cached(db_action)
+
+
+def cached(db_action: DbActionWithCache) -> set[str]:
+    # "<operation>:<values>" of every cached entry.
+    return {
+        key.split(":")[1] + ":" + key.split(":")[3]
+        for key in db_action.cache_manager.cache
+    }
+
+
+def test_update_by_pid_drops_that_pid_and_lists_only(db_action):
+    pool = FakePool(FakeConnection(rows=[{"pid": "a"}], row={"pid": "a"}))
+    assert fill_cache(db_action, pool) == {"fetch:['a']", "fetch:['b']", "fetch_many:['n']"}
+
+    asyncio.run(
+        db_action.update(
+            inputs={"pid": "a", "name": "m"},
+            where_clause="pid = $1",
+            postgresql_connection_pool=pool,
+        )
+    )
+
+    assert cached(db_action) == {"fetch:['b']"}
+
+
+def test_insert_drops_lists_only(db_action):
+    pool = FakePool(FakeConnection(rows=[{"pid": "a"}], row={"pid": "a"}))
+    fill_cache(db_action, pool)
+
+    asyncio.run(
+        db_action.insert_one(
+            inputs={"pid": "c", "name": "m"},
+            postgresql_connection_pool=pool,
+            returning_fields={"pid"},
+        )
+    )
+
+    assert cached(db_action) == {"fetch:['a']", "fetch:['b']"}
+
+
+def test_delete_by_other_column_drops_whole_table(db_action):
+    pool = FakePool(FakeConnection(rows=[{"pid": "a"}], row={"pid": "a"}))
+    fill_cache(db_action, pool)
+
+    asyncio.run(
+        db_action.delete(
+            where_clause="name = $1",
+            values=("n",),
+            postgresql_connection_pool=pool,
+        )
+    )
+
+    assert cached(db_action) == set()
+
+
+def test_delete_many_by_pids_drops_deleted_pids(db_action):
+    pool = FakePool(FakeConnection(rows=[{"pid": "b"}], row={"pid": "a"}))
+    fill_cache(db_action, pool)
+
+    asyncio.run(
+        db_action.delete_many_by_pids(
+            pids=("b",),
+            postgresql_connection_pool=pool,
+        )
+    )
+
+    assert cached(db_action) == {"fetch:['a']"}
+
+
+def test_generator_values_are_used_for_key_tags_and_query(db_action):
+    connection = FakeConnection(row={"pid": "a"})
+    pool = FakePool(connection)
+
+    async def fetch():
+        return await db_action.fetch(
+            where_clause="pid = $1",
+            values=(pid for pid in ("a",)),
+            postgresql_connection_pool=pool,
+            returning_fields={"pid"},
+        )
+
+    assert asyncio.run(fetch()) == {"pid": "a"}
+    assert asyncio.run(fetch()) == {"pid": "a"}
+
+    assert len(connection.queries) == 1
+    assert connection.queries[0][1] == ("a",)
+    assert cached(db_action) == {"fetch:['a']"}
+    assert "item:pid:a" in db_action.cache_manager.tags
+
+
+def test_cached_reads_never_go_to_a_replica(db_action):
+    primary = FakePool(FakeConnection(row={"pid": "a", "name": "new"}))
+    replica = FakePool(FakeConnection(row={"pid": "a", "name": "old"}))
+    pool = RoutedPool(primary=primary, replicas=[replica])
+
+    record = asyncio.run(
+        db_action.fetch(
+            where_clause="pid = $1",
+            values=("a",),
+            postgresql_connection_pool=pool,
+            returning_fields={"pid", "name"},
+        )
+    )
+
+    assert record == {"pid": "a", "name": "new"}
+    assert replica.connection.queries == list()
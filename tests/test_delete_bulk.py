@@ -0,0 +1,75 @@
+import asyncio
+from logging import getLogger
+from uuid import UUID
+
+import pytest
+
+from utils.database.asyncpg.db_action import DbAction
+from utils.dto import ModelDeleteBulkRequest
+from utils.fastapi_utils.service.asyncpg.delete_bulk import delete_bulk
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+PID = "12345678-1234-5678-1234-567812345678"
+
+
+def run_delete_bulk(pids: tuple, deleted_rows: list[dict], columns_types: dict[str, str]):
+    connection = FakeConnection(rows=deleted_rows)
+    results = asyncio.run(
+        delete_bulk(
+            model=ModelDeleteBulkRequest(pids=pids),
+            postgresql_connection_pool=FakePool(connection),
+            db_action=DbAction(
+                table_name="item",
+                all_columns_names={"pid"},
+                columns_types=columns_types,
+            ),
+            logger=getLogger(__name__),
+        )
+    )
+    _, (sent_pids,) = connection.queries[-1]
+    return {pid: result.success for pid, result in results.items()}, sent_pids
+
+
+@pytest.mark.parametrize("columns_types", [{"pid": "uuid"}, dict()])
+def test_uuid_pids_match_in_any_form(columns_types):
+    pids = (PID.upper(), PID.replace("-", ""), "00000000-0000-0000-0000-000000000000")
+
+    results, _ = run_delete_bulk(pids, [{"pid": UUID(PID)}], columns_types)
+
+    assert results == {
+        PID.upper(): True,
+        PID.replace("-", ""): True,
+        "00000000-0000-0000-0000-000000000000": False,
+    }
+
+
+def test_malformed_pid_does_not_fail_a_uuid_batch():
+    results, sent_pids = run_delete_bulk((PID, "not-a-uuid"), [{"pid": UUID(PID)}], {"pid": "uuid"})
+
+    assert results == {PID: True, "not-a-uuid": False}
+    assert list(sent_pids) == [UUID(PID)]
+
+
+def test_integer_pids_are_cast_to_the_column_type():
+    results, sent_pids = run_delete_bulk(("1", "2", "x"), [{"pid": 1}], {"pid": "bigint"})
+
+    assert results == {"1": True, "2": False, "x": False}
+    assert list(sent_pids) == [1, 2]
+
+
+@pytest.mark.parametrize("columns_types", [{"pid": "text"}, dict()])
+def test_text_pids(columns_types):
+    results, sent_pids = run_delete_bulk(("a-1", "b-2"), [{"pid": "b-2"}], columns_types)
+
+    assert results == {"a-1": False, "b-2": True}
+    assert list(sent_pids) == ["a-1", "b-2"]
+
+
+def test_text_pids_are_compared_exactly():
+    results, _ = run_delete_bulk((PID.upper(), PID), [{"pid": PID}], {"pid": "text"})
+
+    assert results == {PID.upper(): False, PID: True}
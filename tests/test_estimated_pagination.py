@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from utils.database.asyncpg.db_action import DbAction
+from utils.database.asyncpg.estimated_count import EstimatedCount
+from utils.database.constant import EnumPaginationCountStrategy
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+
+def paginated_fetch(connection: FakeConnection, current_page: int, page_size: int):
+    db_action = DbAction(
+        table_name="item",
+        all_columns_names={"pid"},
+        pagination_count_strategy=EnumPaginationCountStrategy.ESTIMATED,
+        estimated_count_threshold=10,
+    )
+    return asyncio.run(
+        db_action.paginated_fetch_by_filter(
+            postgresql_connection_pool=FakePool(connection),
+            returning_fields={"pid"},
+            current_page=current_page,
+            page_size=page_size,
+            kwargs={"order_by": dict()},
+        )
+    )
+
+
+def test_unpaginated_fetch_counts_the_rows_it_returned():
+    connection = FakeConnection(rows=[{"pid": index} for index in range(3)])
+
+    records, total = paginated_fetch(connection, current_page=1, page_size=0)
+
+    assert len(records) == total == 3
+    assert not isinstance(total, EstimatedCount)
+    assert len(connection.queries) == 1
+    assert "LIMIT" not in connection.queries[0][0]
+
+
+@pytest.mark.parametrize("current_page", [1, 2])
+def test_unpaginated_fetch_without_rows_is_empty(current_page):
+    records, total = paginated_fetch(FakeConnection(), current_page=current_page, page_size=0)
+
+    assert (records, total) == ([], 0)
+
+
+def test_short_first_page_is_the_exact_total():
+    connection = FakeConnection(rows=[{"pid": 1}])
+
+    records, total = paginated_fetch(connection, current_page=1, page_size=10)
+
+    assert total == 1
+    assert len(connection.queries) == 1
+
+
+@pytest.mark.parametrize(
+    ("estimated_count", "expected"),
+    [
+        (3, 7),
+        (50, EstimatedCount(50)),
+    ],
+)
+def test_full_page_uses_estimate_above_threshold(estimated_count, expected):
+    connection = FakeConnection(
+        rows=[{"pid": 1}, {"pid": 2}],
+        row={"estimated_count": estimated_count, "total_count": 7},
+    )
+
+    records, total = paginated_fetch(connection, current_page=1, page_size=2)
+
+    assert total == expected
+    assert isinstance(total, EstimatedCount) == isinstance(expected, EstimatedCount)
+
+
+def test_estimate_is_never_below_rows_served():
+    connection = FakeConnection(
+        rows=[{"pid": 1}, {"pid": 2}],
+        row={"estimated_count": 10, "total_count": 7},
+    )
+
+    records, total = paginated_fetch(connection, current_page=9, page_size=2)
+
+    assert total == EstimatedCount(18)
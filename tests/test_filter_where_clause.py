@@ -0,0 +1,79 @@
+import asyncio
+
+from utils.database.asyncpg.db_action import DbAction
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+
+def create_db_action() -> DbAction:
+    return DbAction(
+        table_name="item",
+        all_columns_names={"pid", "name", "status", "price"},
+        ilike_columns_names={"name"},
+        equality_columns_names={"name", "status"},
+        range_columns_names={"status", "price"},
+    )
+
+
+def stream_query(db_action: DbAction, kwargs: dict) -> tuple[str, tuple]:
+    connection = FakeConnection()
+
+    async def run():
+        async for _ in db_action.stream_by_filter(
+            postgresql_connection_pool=FakePool(connection),
+            returning_fields={"pid"},
+            kwargs=kwargs,
+        ):
+            pass
+
+    asyncio.run(run())
+    return connection.queries[0]
+
+
+def test_ilike_takes_precedence_over_equality():
+    query, values = stream_query(create_db_action(), {"name": ["red car", "blue"]})
+
+    assert "WHERE (name ILIKE $1 AND name ILIKE $2 OR name ILIKE $3)" in query
+    assert values == ("%red%", "%car%", "%blue%")
+
+
+def test_equality_takes_precedence_over_range():
+    query, values = stream_query(create_db_action(), {"status": ["new", "paid"]})
+
+    assert "WHERE status = ANY($1)" in query
+    assert values == (["new", "paid"],)
+
+
+def test_range_keys_map_to_their_bounds():
+    query, values = stream_query(
+        create_db_action(),
+        {"price_from": 10, "price_to": 20, "price_to_from": 15},
+    )
+
+    assert "WHERE price >= $1 AND price <= $2 AND price >= $3" in query
+    assert values == (10, 20, 15)
+
+
+def test_placeholders_continue_across_filter_kinds():
+    query, values = stream_query(
+        create_db_action(),
+        {
+            "name": ["red"],
+            "unknown": ["x"],
+            "status": [],
+            "price_to": 20,
+        },
+    )
+
+    assert "WHERE (name ILIKE $1) AND price <= $2" in query
+    assert values == ("%red%", 20)
+
+
+def test_no_filters_produce_no_where_clause():
+    query, values = stream_query(create_db_action(), {"status": []})
+
+    assert "WHERE" not in query
+    assert values == ()
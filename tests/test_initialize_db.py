@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from utils.database.asyncpg import initialize_db as initialize_db_module
+from utils.database.asyncpg.initialize_db import initialize_db
+from utils.database.asyncpg.routed_pool import RoutedPool
+
+
+class ClosablePool:
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self.is_closed = False
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+
+@pytest.fixture
+def created_pools(monkeypatch) -> list[ClosablePool]:
+    created_pools = list()
+
+    async def create_pool(dsn: str, **kwargs) -> ClosablePool:
+        if "unreachable" in dsn:
+            raise OSError(f"cannot connect to {dsn}")
+        pool = ClosablePool(dsn=dsn)
+        created_pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(initialize_db_module, "create_pool", create_pool)
+    return created_pools
+
+
+def run_initialize_db(app: FastAPI, replica_connection_strings: list[str]):
+    return asyncio.run(
+        initialize_db(
+            app=app,
+            connection_string="primary",
+            minimum_number_of_connection=1,
+            maximum_number_of_connection=2,
+            maximum_queries_to_restart_connection=100,
+            maximum_inactive_connection_lifetime_in_second=60,
+            replica_connection_strings=replica_connection_strings,
+        )
+    )
+
+
+def test_failed_replica_closes_pools_created_so_far(created_pools):
+    app = FastAPI()
+
+    with pytest.raises(OSError, match="unreachable"):
+        run_initialize_db(app, ["replica_1", "unreachable", "replica_3"])
+
+    assert [pool.dsn for pool in created_pools] == ["primary", "replica_1"]
+    assert all(pool.is_closed for pool in created_pools)
+    assert not hasattr(app.state, "pool")
+
+
+def test_replicas_are_routed(created_pools):
+    app = FastAPI()
+
+    pool = run_initialize_db(app, ["replica_1"])
+
+    assert isinstance(pool, RoutedPool)
+    assert app.state.pool is pool
+    assert not any(created_pool.is_closed for created_pool in created_pools)
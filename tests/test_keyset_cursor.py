@@ -0,0 +1,162 @@
+import asyncio
+from base64 import urlsafe_b64encode
+from datetime import (
+    datetime,
+    UTC,
+)
+from decimal import Decimal
+from json import dumps
+from uuid import UUID
+
+import pytest
+
+from utils.database.asyncpg.db_action import DbAction
+from utils.database.asyncpg.keyset_cursor import (
+    calculate_keyset_fingerprint,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+)
+from utils.exception import ProjectBaseException
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+FINGERPRINT = calculate_keyset_fingerprint("item", [("created_at", "D"), ("pid", "D")], "", [])
+
+
+def raw_cursor(payload) -> str:
+    return urlsafe_b64encode(dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trip_keeps_types():
+    values = [
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+        UUID("12345678-1234-5678-1234-567812345678"),
+        Decimal("1.10"),
+        "text",
+        7,
+        None,
+    ]
+
+    cursor = encode_keyset_cursor(values=values, fingerprint=FINGERPRINT)
+
+    assert decode_keyset_cursor(
+        cursor=cursor,
+        expected_length=len(values),
+        fingerprint=FINGERPRINT,
+    ) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        raw_cursor(["a"]),
+        raw_cursor({"a": 1}),
+        raw_cursor({"f": FINGERPRINT, "v": {"a": 1}}),
+        raw_cursor({"f": FINGERPRINT, "v": ["a"]}),
+        raw_cursor({"f": FINGERPRINT, "v": ["a", "b", "c"]}),
+        raw_cursor({"f": FINGERPRINT, "v": ["a", {"x": "1"}]}),
+        raw_cursor({"f": FINGERPRINT, "v": ["a", {"u": 1}]}),
+        raw_cursor({"f": FINGERPRINT, "v": ["a", ["b"]]}),
+        raw_cursor({"f": FINGERPRINT, "v": ["a", "b"], "extra": 1}),
+        raw_cursor({"f": "0" * 16, "v": ["a", "b"]}),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ProjectBaseException) as error:
+        decode_keyset_cursor(cursor=cursor, expected_length=2, fingerprint=FINGERPRINT)
+
+    assert error.value.status_code == 400
+
+
+def test_fingerprint_depends_on_order_and_filter():
+    assert FINGERPRINT != calculate_keyset_fingerprint("item", [("created_at", "A"), ("pid", "A")], "", [])
+    assert FINGERPRINT != calculate_keyset_fingerprint(
+        "item",
+        [("created_at", "D"), ("pid", "D")],
+        "WHERE name = $1",
+        ["x"],
+    )
+
+
+def keyset_fetch(db_action: DbAction, connection: FakeConnection, cursor: str | None, **kwargs):
+    return asyncio.run(
+        db_action.keyset_fetch_by_filter(
+            postgresql_connection_pool=FakePool(connection),
+            returning_fields={"pid", "name"},
+            page_size=2,
+            cursor=cursor,
+            kwargs=kwargs,
+        )
+    )
+
+
+def test_keyset_fetch_rejects_cursor_from_another_order():
+    db_action = DbAction(
+        table_name="item",
+        all_columns_names={"pid", "name", "created_at"},
+    )
+    rows = [
+        {"pid": index, "name": f"n{index}", "created_at": datetime(2024, 1, index, tzinfo=UTC)}
+        for index in (1, 2, 3)
+    ]
+    connection = FakeConnection(rows=rows)
+
+    records, next_cursor = keyset_fetch(db_action, connection, None, order_by={"created_at": "A"})
+    assert records == rows[:2]
+
+    keyset_fetch(db_action, connection, next_cursor, order_by={"created_at": "A"})
+    _, values = connection.queries[-1]
+    assert values == (datetime(2024, 1, 2, tzinfo=UTC), 2)
+
+    with pytest.raises(ProjectBaseException):
+        keyset_fetch(db_action, connection, next_cursor, order_by={"created_at": "D"})
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_keyset_fetch_rejects_empty_pages(page_size):
+    db_action = DbAction(table_name="item", all_columns_names={"pid"})
+
+    with pytest.raises(ProjectBaseException) as error:
+        asyncio.run(
+            db_action.keyset_fetch_by_filter(
+                postgresql_connection_pool=FakePool(),
+                returning_fields={"pid"},
+                page_size=page_size,
+                cursor=None,
+                kwargs={"order_by": dict()},
+            )
+        )
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("order_by", "expected"),
+    [
+        (dict(), [("pid", "A")]),
+        ({"pid": "D"}, [("pid", "D")]),
+        ({"created_at": "D"}, [("created_at", "D"), ("pid", "D")]),
+        ({"created_at": "A", "name": "D"}, [("created_at", "A"), ("name", "D"), ("pid", "D")]),
+        ({"pid": "D", "created_at": "A"}, [("pid", "D"), ("created_at", "A")]),
+        ({"created_at": "A", "pid": "D"}, [("created_at", "A"), ("pid", "D")]),
+        ({"unknown": "A", "created_at": "D"}, [("created_at", "D"), ("pid", "D")]),
+    ],
+)
+def test_prepare_seek_columns(order_by, expected):
+    db_action = DbAction(table_name="item", all_columns_names={"pid", "name", "created_at"})
+
+    assert db_action._prepare_seek_columns(order_by=order_by) == expected
+
+
+def test_keyset_fetch_orders_by_explicit_pid_direction():
+    db_action = DbAction(table_name="item", all_columns_names={"pid", "name"})
+    connection = FakeConnection()
+
+    keyset_fetch(db_action, connection, None, order_by={"pid": "D"})
+
+    query, _ = connection.queries[-1]
+    assert "ORDER BY pid DESC" in query
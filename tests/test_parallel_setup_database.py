@@ -0,0 +1,139 @@
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from utils.database import load_database_scripts_and_add
+from utils.database.asyncpg import parallel_setup_database as parallel_setup_database_module
+from utils.database.asyncpg.parallel_setup_database import (
+    _execute_script,
+    _find_concurrent_index_name,
+    _make_index_concurrent,
+    parallel_setup_database,
+)
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+
+class FailingConnection(FakeConnection):
+    async def execute(self, query, *values):
+        if query.startswith("CREATE"):
+            self.queries.append((query, values))
+            raise RuntimeError("deadlock detected")
+        return await super().execute(query, *values)
+
+
+def execute_script(connection: FakeConnection, script: str):
+    return asyncio.run(
+        _execute_script(
+            pool=FakePool(connection),
+            code_name="indexes",
+            checksum="0" * 64,
+            script=script,
+            tracking_table_name="database_setup_script",
+            logger=getLogger(__name__),
+        )
+    )
+
+
+def recorded_checksum(connection: FakeConnection) -> bool:
+    return any("INSERT INTO database_setup_script" in query for query, _ in connection.queries)
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        ("CREATE INDEX CONCURRENTLY ix_a ON a (x);", "ix_a"),
+        ("create unique index concurrently if not exists public.ix_a on a (x);", "public.ix_a"),
+        ('CREATE INDEX CONCURRENTLY "Ix A" ON a (x);', '"Ix A"'),
+        ("CREATE INDEX CONCURRENTLY ON a (x);", None),
+        ("CREATE TABLE a ();", None),
+    ],
+)
+def test_find_concurrent_index_name(statement, expected):
+    assert _find_concurrent_index_name(statement) == expected
+
+
+def test_make_index_concurrent_after_comments():
+    assert _make_index_concurrent("-- a\n/* b */ CREATE INDEX ix ON a (x);") == (
+        "-- a\n/* b */ CREATE INDEX CONCURRENTLY ix ON a (x);"
+    )
+
+
+def test_failed_index_build_drops_invalid_index():
+    connection = FailingConnection(row=True)
+
+    with pytest.raises(RuntimeError, match="deadlock"):
+        execute_script(connection, "CREATE INDEX CONCURRENTLY ix_a ON a (x);")
+
+    assert connection.queries[-1] == ("DROP INDEX CONCURRENTLY IF EXISTS ix_a;", ())
+    assert not recorded_checksum(connection)
+
+
+def test_index_left_invalid_is_dropped_and_not_recorded():
+    connection = FakeConnection(row=True)
+
+    with pytest.raises(RuntimeError, match="left invalid"):
+        execute_script(connection, "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_a ON a (x);")
+
+    assert connection.queries[-1] == ("DROP INDEX CONCURRENTLY IF EXISTS ix_a;", ())
+    assert not recorded_checksum(connection)
+
+
+def test_valid_index_is_recorded():
+    connection = FakeConnection(row=False)
+
+    result = execute_script(connection, "CREATE INDEX CONCURRENTLY ix_a ON a (x);")
+
+    assert result["skipped"] is False
+    assert recorded_checksum(connection)
+    assert not any(query.startswith("DROP") for query, _ in connection.queries)
+
+
+def test_loaded_multi_line_scripts_run_whole(tmp_path, monkeypatch):
+    (tmp_path / "sql").mkdir()
+    (tmp_path / "sql" / "tables.sql").write_text(
+        "-- tables\nCREATE TABLE a (\n    x INT\n);\nCREATE TABLE b (\n    y INT\n);\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "sql" / "indexes.sql").write_text(
+        "CREATE INDEX ix_a\n    ON a (x);\nCREATE INDEX ix_b ON b (y);\n",
+        encoding="utf-8",
+    )
+    sqls = {"tables": list(), "indexes": list()}
+    load_database_scripts_and_add(
+        this_file_path=tmp_path / "setup.py",
+        sqls=sqls,
+        logger=getLogger(__name__),
+    )
+    assert len(sqls["tables"]) > 2
+
+    connection = FakeConnection(row=False)
+    monkeypatch.setattr(
+        parallel_setup_database_module,
+        "create_pool",
+        lambda **kwargs: FakePool(connection),
+    )
+
+    timings = asyncio.run(
+        parallel_setup_database(
+            connection_string="postgresql://",
+            sqls=sqls,
+            logger=getLogger(__name__),
+        )
+    )
+
+    executed = [
+        query
+        for query, _ in connection.queries
+        if query.startswith("CREATE") and "database_setup_script" not in query
+    ]
+    assert executed == [
+        "CREATE TABLE a (\n    x INT\n);\nCREATE TABLE b (\n    y INT\n);",
+        "CREATE INDEX CONCURRENTLY ix_a\n    ON a (x);",
+        "CREATE INDEX CONCURRENTLY ix_b ON b (y);",
+    ]
+    assert [timing["code_name"] for timing in timings] == ["tables", "indexes", "indexes"]
@@ -0,0 +1,67 @@
+import pytest
+
+from utils.database.asyncpg.db_action import DbAction
+from utils.database.asyncpg.schema_catalog import SchemaCatalog
+
+
+def column(schema_name: str, table_name: str, column_name: str, data_type: str) -> dict[str, str]:
+    return {
+        "schema_name": schema_name,
+        "table_name": table_name,
+        "column_name": column_name,
+        "data_type": data_type,
+        "udt_name": data_type,
+        "column_type": data_type,
+    }
+
+
+@pytest.fixture
+def schema_catalog() -> SchemaCatalog:
+    return SchemaCatalog(
+        columns=[
+            column("public", "item", "pid", "uuid"),
+            column("public", "item", "created_at", "timestamp with time zone"),
+            column("public", "event", "pid", "uuid"),
+            column("archive", "event", "pid", "uuid"),
+            column("archive", "event", "archived_at", "timestamp without time zone"),
+        ],
+        enums=dict(),
+    )
+
+
+def test_tables_are_keyed_by_schema(schema_catalog):
+    assert set(schema_catalog.tables) == {"public.item", "public.event", "archive.event"}
+    assert schema_catalog.get_all_columns_names("archive.event") == {"pid", "archived_at"}
+    assert schema_catalog.get_all_columns_names("public.event") == {"pid"}
+
+
+def test_unqualified_name_resolves_when_unique(schema_catalog):
+    assert schema_catalog.resolve_table_name("item") == "public.item"
+    assert schema_catalog.get_columns_by_type("item", {"uuid"}) == {"pid"}
+
+
+def test_ambiguous_unqualified_name_raises(schema_catalog):
+    with pytest.raises(ValueError, match="ambiguous"):
+        schema_catalog.get_columns_types("event")
+
+
+def test_unknown_table_raises(schema_catalog):
+    with pytest.raises(ValueError, match="not in the schema catalog"):
+        schema_catalog.get_all_columns_names("itme")
+
+    with pytest.raises(ValueError):
+        schema_catalog.create_db_action(table_name="itme")
+
+
+def test_create_db_action(schema_catalog):
+    db_action = schema_catalog.create_db_action(table_name="item")
+
+    assert isinstance(db_action, DbAction)
+    assert db_action.all_columns_names == {"pid", "created_at"}
+    assert db_action.columns_types == {"pid": "uuid", "created_at": "timestamp with time zone"}
+
+
+def test_round_trip_through_dict(schema_catalog):
+    restored = SchemaCatalog.from_dict(schema_catalog.to_dict())
+
+    assert restored.tables == schema_catalog.tables
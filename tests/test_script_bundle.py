@@ -0,0 +1,56 @@
+from functools import partial
+from json import loads
+
+from utils.database.compile_script import strip_comment_lines
+from utils.database.script_bundle import load_script_bundle
+from utils.database.sql_statements import strip_sql_comments
+
+
+def write_script(tmp_path, content: str):
+    path = tmp_path / "tables.sql"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_bundle_is_reused_when_files_are_unchanged(tmp_path):
+    path = write_script(tmp_path, "CREATE TABLE a(); -- x\n")
+    bundle_cache_path = tmp_path / "cache" / "bundle.json"
+    calls = list()
+
+    def compile_content(content: str) -> str:
+        calls.append(content)
+        return strip_sql_comments(content)
+
+    first = load_script_bundle([path], compile_content, bundle_cache_path)
+    second = load_script_bundle([path], compile_content, bundle_cache_path)
+
+    assert first == second == {path: "CREATE TABLE a();"}
+    assert len(calls) == 1
+
+
+def test_bundle_is_recompiled_when_content_changes(tmp_path):
+    path = write_script(tmp_path, "CREATE TABLE a();\n")
+    bundle_cache_path = tmp_path / "bundle.json"
+    load_script_bundle([path], strip_sql_comments, bundle_cache_path)
+
+    path.write_text("CREATE TABLE b(); -- changed\n", encoding="utf-8")
+
+    assert load_script_bundle([path], strip_sql_comments, bundle_cache_path) == {
+        path: "CREATE TABLE b();",
+    }
+
+
+def test_bundle_is_keyed_on_the_compile_function(tmp_path):
+    path = write_script(tmp_path, "SELECT 1; -- inline\n# hash\n")
+    bundle_cache_path = tmp_path / "bundle.json"
+
+    sql = load_script_bundle([path], strip_sql_comments, bundle_cache_path)
+    hash_lines = load_script_bundle(
+        [path],
+        partial(strip_comment_lines, comment_start_with="#"),
+        bundle_cache_path,
+    )
+
+    assert sql == {path: "SELECT 1;\n# hash"}
+    assert hash_lines == {path: "SELECT 1; -- inline"}
+    assert "strip_comment_lines" in loads(bundle_cache_path.read_text())["compile_key"]
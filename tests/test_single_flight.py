@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from .fakes import create_db_action_with_cache
+
+
+class Fetcher:
+    # Counts calls and blocks each one until `release` is set.
+    def __init__(self, result=("row",), error: Exception | None = None) -> None:
+        self.result = list(result)
+        self.error = error
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def fetch(db_action, fetcher, key: str = "key"):
+    return asyncio.create_task(
+        db_action._fetch_with_cache(key=key, tags=("item",), fetcher=fetcher)
+    )
+
+
+def test_concurrent_misses_share_one_query():
+    async def main():
+        db_action = create_db_action_with_cache()
+        fetcher = Fetcher()
+        tasks = [fetch(db_action, fetcher) for _ in range(5)]
+        await fetcher.started.wait()
+        await asyncio.sleep(0)
+        fetcher.release.set()
+
+        assert await asyncio.gather(*tasks) == [["row"]] * 5
+        assert fetcher.calls == 1
+        assert db_action.in_flight == dict()
+        assert db_action.cache_manager.cache["key"][1] == ["row"]
+
+    asyncio.run(main())
+
+
+def test_different_keys_do_not_coalesce():
+    async def main():
+        db_action = create_db_action_with_cache()
+        fetcher = Fetcher()
+        tasks = [fetch(db_action, fetcher, key=f"key{index}") for index in range(3)]
+        await asyncio.sleep(0)
+        fetcher.release.set()
+        await asyncio.gather(*tasks)
+
+        assert fetcher.calls == 3
+
+    asyncio.run(main())
+
+
+def test_error_is_shared_and_not_cached():
+    async def main():
+        db_action = create_db_action_with_cache()
+        fetcher = Fetcher(error=RuntimeError("boom"))
+        tasks = [fetch(db_action, fetcher) for _ in range(3)]
+        await fetcher.started.wait()
+        await asyncio.sleep(0)
+        fetcher.release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert [str(result) for result in results] == ["boom"] * 3
+        assert fetcher.calls == 1
+        assert db_action.in_flight == dict()
+        assert db_action.cache_manager.cache == dict()
+
+        # The next miss queries again.
+        fetcher.error = None
+        assert await fetch(db_action, fetcher) == ["row"]
+        assert fetcher.calls == 2
+
+    asyncio.run(main())
+
+
+def test_cancelled_leader_lets_waiters_run_their_own_query():
+    async def main():
+        db_action = create_db_action_with_cache()
+        fetcher = Fetcher()
+        leader = fetch(db_action, fetcher)
+        await fetcher.started.wait()
+        waiters = [fetch(db_action, fetcher) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        fetcher.release.set()
+
+        assert await asyncio.gather(*waiters) == [["row"]] * 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert fetcher.calls == 3
+        assert db_action.in_flight == dict()
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_cancel_the_leader():
+    async def main():
+        db_action = create_db_action_with_cache()
+        fetcher = Fetcher()
+        leader = fetch(db_action, fetcher)
+        await fetcher.started.wait()
+        waiter = fetch(db_action, fetcher)
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        await asyncio.sleep(0)
+        fetcher.release.set()
+
+        assert await leader == ["row"]
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert fetcher.calls == 1
+
+    asyncio.run(main())
+
+
+def test_waiter_runs_its_own_query_after_the_timeout():
+    async def main():
+        db_action = create_db_action_with_cache(single_flight_timeout_in_seconds=0.01)
+        slow = Fetcher(result=("slow",))
+        fast = Fetcher(result=("fast",))
+        fast.release.set()
+        leader = fetch(db_action, slow)
+        await slow.started.wait()
+
+        assert await fetch(db_action, fast) == ["fast"]
+
+        slow.release.set()
+        assert await leader == ["slow"]
+
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+import pytest
+
+from utils.database.sql_statements import (
+    split_sql_statements,
+    strip_sql_comments,
+)
+
+
+@pytest.mark.parametrize(
+    ("script", "expected"),
+    [
+        ("SELECT 1; -- one", "SELECT 1;"),
+        ("SELECT '-- not a comment';", "SELECT '-- not a comment';"),
+        ("SELECT 'it''s -- x';", "SELECT 'it''s -- x';"),
+        ('SELECT "odd--name" FROM t;', 'SELECT "odd--name" FROM t;'),
+        ("SELECT E'it\\'s -- x';", "SELECT E'it\\'s -- x';"),
+        ("SELECT E'a\\\\' -- x", "SELECT E'a\\\\'"),
+        ("SELECT $$ -- kept $$;", "SELECT $$ -- kept $$;"),
+        ("SELECT $body$ /* kept */ $body$;", "SELECT $body$ /* kept */ $body$;"),
+        ("SELECT /* a /* nested */ still comment */ 1;", "SELECT   1;"),
+        ("-- whole line\n\nSELECT 1;", "SELECT 1;"),
+    ],
+)
+def test_strip_sql_comments(script, expected):
+    assert strip_sql_comments(script) == expected
+
+
+def test_strip_sql_comments_keeps_tokens_apart():
+    assert strip_sql_comments("SELECT/**/1;") == "SELECT 1;"
+
+
+def test_split_sql_statements_respects_quotes():
+    script = """
+CREATE INDEX a ON t (x);
+SELECT 'a;b', "c;d", E'e\\';f';
+CREATE FUNCTION f() RETURNS trigger AS $body$ BEGIN RETURN NEW; END; $body$ LANGUAGE plpgsql;
+/* ; */ SELECT 2
+"""
+    assert split_sql_statements(script) == [
+        "CREATE INDEX a ON t (x);",
+        "SELECT 'a;b', \"c;d\", E'e\\';f';",
+        "CREATE FUNCTION f() RETURNS trigger AS $body$ BEGIN RETURN NEW; END; $body$ LANGUAGE plpgsql;",
+        "/* ; */ SELECT 2;",
+    ]
+
+
+def test_split_sql_statements_drops_empty_statements():
+    assert split_sql_statements("SELECT 1;;  ;\n-- trailing comment\n") == ["SELECT 1;"]
+    assert split_sql_statements(";;") == list()
+
+
+def test_identifier_ending_in_e_is_not_an_e_string():
+    assert split_sql_statements("SELECT name'x\\'; SELECT 2") == ["SELECT name'x\\';", "SELECT 2;"]
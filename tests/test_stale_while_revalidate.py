@@ -0,0 +1,197 @@
+import asyncio
+from logging import getLogger
+
+import pytest
+
+from utils.cache import InMemoryCacheManager
+
+from .fakes import (
+    clock,
+    create_db_action_with_cache,
+)
+
+SOFT_TTL = 10
+HARD_TTL = 60
+
+
+class Refresher:
+    def __init__(self, value="fresh", error: Exception | None = None) -> None:
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.value
+
+
+def create_cache_manager(**kwargs) -> InMemoryCacheManager:
+    cache_manager = InMemoryCacheManager(logger=getLogger(__name__), name="test", **kwargs)
+    cache_manager.insert_in_cache_with_stale_while_revalidate(
+        key="key",
+        value="stale",
+        soft_ttl_in_seconds=SOFT_TTL,
+        hard_ttl_in_seconds=HARD_TTL,
+        tags=("item",),
+    )
+    return cache_manager
+
+
+def read(cache_manager: InMemoryCacheManager, refresher: Refresher, key: str = "key"):
+    return cache_manager.fetch_from_cache_with_stale_while_revalidate(
+        key=key,
+        refresher=refresher,
+        soft_ttl_in_seconds=SOFT_TTL,
+        hard_ttl_in_seconds=HARD_TTL,
+        tags=("item",),
+    )
+
+
+async def settle(cache_manager: InMemoryCacheManager) -> None:
+    await asyncio.gather(*cache_manager.refreshing.values())
+
+
+def test_fresh_entry_is_served_without_refresh(clock):
+    async def main():
+        cache_manager = create_cache_manager()
+        refresher = Refresher()
+        clock.now += SOFT_TTL - 0.1
+
+        assert read(cache_manager, refresher) == "stale"
+        assert cache_manager.refreshing == dict()
+        assert cache_manager.stale_hits == 0
+
+    asyncio.run(main())
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    async def main():
+        cache_manager = create_cache_manager()
+        refresher = Refresher()
+        clock.now += SOFT_TTL
+
+        assert read(cache_manager, refresher) == "stale"
+        assert read(cache_manager, refresher) == "stale"
+        await asyncio.sleep(0)
+        assert refresher.calls == 1
+        assert cache_manager.stale_hits == 2
+
+        refresher.release.set()
+        await settle(cache_manager)
+
+        assert read(cache_manager, refresher) == "fresh"
+        assert cache_manager.soft_expirations["key"] == clock.now + SOFT_TTL
+        assert cache_manager.cache["key"][0] == clock.now + HARD_TTL
+        assert cache_manager.tags["item"] == {"key"}
+        assert cache_manager.refreshes == 1
+
+    asyncio.run(main())
+
+
+def test_entry_past_hard_ttl_is_a_miss(clock):
+    async def main():
+        cache_manager = create_cache_manager()
+        clock.now += HARD_TTL
+
+        assert read(cache_manager, Refresher()) is None
+        assert "key" not in cache_manager.soft_expirations
+
+    asyncio.run(main())
+
+
+def test_zero_hard_ttl_keeps_entry_until_invalidated(clock):
+    cache_manager = InMemoryCacheManager(logger=getLogger(__name__), name="test")
+    cache_manager.insert_in_cache_with_stale_while_revalidate(
+        key="key",
+        value="value",
+        soft_ttl_in_seconds=SOFT_TTL,
+    )
+
+    assert cache_manager.cache["key"][0] is None
+    assert cache_manager.expiry_heap == list()
+
+
+def test_invalidation_during_refresh_discards_the_refreshed_value(clock):
+    async def main():
+        cache_manager = create_cache_manager()
+        refresher = Refresher()
+        clock.now += SOFT_TTL
+        read(cache_manager, refresher)
+        await asyncio.sleep(0)
+
+        cache_manager.invalidate_tags(tags=("item",))
+        refresher.release.set()
+        await settle(cache_manager)
+
+        assert "key" not in cache_manager.cache
+
+    asyncio.run(main())
+
+
+def test_failed_refresh_keeps_stale_value(clock):
+    async def main():
+        cache_manager = create_cache_manager()
+        refresher = Refresher(error=RuntimeError("boom"))
+        refresher.release.set()
+        clock.now += SOFT_TTL
+        read(cache_manager, refresher)
+        await settle(cache_manager)
+
+        assert cache_manager.refresh_failures == 1
+        assert cache_manager.refreshing == dict()
+        assert read(cache_manager, refresher) == "stale"
+
+    asyncio.run(main())
+
+
+def test_concurrent_refreshes_are_bounded(clock):
+    async def main():
+        cache_manager = create_cache_manager(maximum_concurrent_refreshes=1)
+        cache_manager.insert_in_cache_with_stale_while_revalidate(
+            key="other",
+            value="stale",
+            soft_ttl_in_seconds=SOFT_TTL,
+        )
+        refresher = Refresher()
+        clock.now += SOFT_TTL
+
+        assert read(cache_manager, refresher) == "stale"
+        assert read(cache_manager, refresher, key="other") == "stale"
+        assert set(cache_manager.refreshing) == {"key"}
+
+        refresher.release.set()
+        await settle(cache_manager)
+
+    asyncio.run(main())
+
+
+def test_db_action_serves_stale_reports(clock):
+    async def main():
+        db_action = create_db_action_with_cache(
+            stale_while_revalidate_soft_ttl_in_seconds=SOFT_TTL,
+        )
+        refresher = Refresher(value=["first"])
+        refresher.release.set()
+
+        async def fetch():
+            return await db_action._fetch_with_cache(
+                key="report",
+                tags=("item",),
+                fetcher=refresher,
+                stale_while_revalidate=True,
+            )
+
+        assert await fetch() == ["first"]
+        refresher.value = ["second"]
+        clock.now += SOFT_TTL
+
+        assert await fetch() == ["first"]
+        await settle(db_action.cache_manager)
+        assert await fetch() == ["second"]
+        assert refresher.calls == 2
+
+    asyncio.run(main())
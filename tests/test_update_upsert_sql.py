@@ -0,0 +1,96 @@
+import asyncio
+
+from utils.database.asyncpg.db_action import DbAction
+
+from .fakes import (
+    FakeConnection,
+    FakePool,
+)
+
+
+def create_db_action() -> DbAction:
+    return DbAction(
+        table_name="item",
+        all_columns_names={"pid", "name", "price"},
+        columns_types={"pid": "uuid", "name": "text", "price": "numeric(10,2)"},
+    )
+
+
+def test_update_many_casts_the_first_row_and_returns_target_columns():
+    connection = FakeConnection()
+
+    asyncio.run(
+        create_db_action().update_many(
+            inputs_list=[
+                {"pid": "a", "name": "x", "price": 1},
+                {"pid": "b", "name": "y", "price": 2},
+            ],
+            postgresql_connection_pool=FakePool(connection),
+            returning_fields={"pid", "name", "missing"},
+            add_updated_at=False,
+        )
+    )
+
+    [(query, values)] = connection.queries
+    assert query == (
+        """UPDATE item AS target
+SET name = source.name, price = source.price
+FROM (VALUES ($1::uuid, $2::text, $3::numeric(10,2)), ($4, $5, $6)) AS source (pid, name, price)
+WHERE target.pid = source.pid
+RETURNING target.name,target.pid;"""
+    )
+    assert values == ("a", "x", 1, "b", "y", 2)
+
+
+def test_update_many_without_returning_fields_ends_the_statement():
+    connection = FakeConnection()
+
+    asyncio.run(
+        create_db_action().update_many(
+            inputs_list=[{"pid": "a", "name": "x"}],
+            postgresql_connection_pool=FakePool(connection),
+            key_columns=("pid", "name"),
+            add_updated_at=False,
+            with_transact=False,
+        )
+    )
+
+    [(query, _)] = connection.queries
+    assert query.endswith("WHERE target.pid = source.pid AND target.name = source.name;")
+    assert "RETURNING" not in query
+
+
+def test_upsert_many_updates_the_non_conflict_columns():
+    connection = FakeConnection()
+
+    asyncio.run(
+        create_db_action().upsert_many(
+            inputs_list=[{"pid": "a", "name": "x"}, {"pid": "b", "name": "y"}],
+            postgresql_connection_pool=FakePool(connection),
+            returning_fields={"pid"},
+            direct_set_clause=["price = item.price + 1"],
+        )
+    )
+
+    [(query, values)] = connection.queries
+    assert query == (
+        "INSERT INTO item (pid, name) VALUES ($1, $2), ($3, $4)"
+        " ON CONFLICT (pid) DO UPDATE SET name = EXCLUDED.name, price = item.price + 1"
+        " RETURNING pid;"
+    )
+    assert values == ("a", "x", "b", "y")
+
+
+def test_upsert_many_without_a_set_clause_does_nothing_on_conflict():
+    connection = FakeConnection()
+
+    asyncio.run(
+        create_db_action().upsert_many(
+            inputs_list=[{"pid": "a"}],
+            postgresql_connection_pool=FakePool(connection),
+        )
+    )
+
+    [(query, values)] = connection.queries
+    assert query == "INSERT INTO item (pid) VALUES ($1) ON CONFLICT (pid) DO NOTHING;"
+    assert values == ("a",)
@@ -1 +1,2 @@
-from .in_memory_cache_manager import InMemoryCacheManager
\ No newline at end of file
+from .in_memory_cache_manager import InMemoryCacheManager
+from .constant import EnumEvictionPolicy
\ No newline at end of file
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class EnumEvictionPolicy(str, Enum):
+    LRU = "LRU"  # EVICT THE LEAST RECENTLY USED ENTRY
+    LFU = "LFU"  # EVICT THE LEAST FREQUENTLY USED ENTRY, OLDEST FIRST ON TIES
+    TINY_LFU = "TINY_LFU"  # LRU ORDER, BUT A NEW KEY IS ONLY ADMITTED IF READ AT LEAST AS OFTEN AS THE VICTIM
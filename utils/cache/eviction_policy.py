@@ -0,0 +1,197 @@
+from collections import (
+    defaultdict,
+    OrderedDict,
+)
+from hashlib import blake2b
+from typing import (
+    Hashable,
+    Iterator,
+)
+
+
+class LruEvictionPolicy:
+    def __init__(self) -> None:
+        self.keys: OrderedDict[Hashable, None] = OrderedDict()
+        return None
+
+    def on_insert(self, key: Hashable) -> None:
+        self.keys[key] = None
+        self.keys.move_to_end(key)
+        return None
+
+    def on_access(self, key: Hashable) -> None:
+        if key in self.keys:
+            self.keys.move_to_end(key)
+        return None
+
+    def on_miss(self, key: Hashable) -> None:
+        return None
+
+    def on_remove(self, key: Hashable) -> None:
+        self.keys.pop(key, None)
+        return None
+
+    def victims(self) -> Iterator[Hashable]:
+        return iter(self.keys)
+
+    def admit(
+            self,
+            candidate: Hashable,
+            victim: Hashable,
+    ) -> bool:
+        return True
+
+    def clear(self) -> None:
+        self.keys.clear()
+        return None
+
+
+class LfuEvictionPolicy:
+    # Keys are grouped by hit count, so bookkeeping is O(1) and the first
+    # victim is the oldest key of the lowest non-empty group.
+    def __init__(self) -> None:
+        self.frequencies: dict[Hashable, int] = dict()
+        self.groups: defaultdict[int, OrderedDict[Hashable, None]] = defaultdict(OrderedDict)
+        self.minimum_frequency = 0
+        return None
+
+    def on_insert(self, key: Hashable) -> None:
+        if key in self.frequencies:
+            return self.on_access(key)
+
+        self.frequencies[key] = 1
+        self.groups[1][key] = None
+        self.minimum_frequency = 1
+        return None
+
+    def on_access(self, key: Hashable) -> None:
+        frequency = self.frequencies.get(key)
+        if frequency is None:
+            return None
+
+        group = self.groups[frequency]
+        del group[key]
+        if not group:
+            del self.groups[frequency]
+            if self.minimum_frequency == frequency:
+                self.minimum_frequency = frequency + 1
+
+        self.frequencies[key] = frequency + 1
+        self.groups[frequency + 1][key] = None
+        return None
+
+    def on_miss(self, key: Hashable) -> None:
+        return None
+
+    def on_remove(self, key: Hashable) -> None:
+        frequency = self.frequencies.pop(key, None)
+        if frequency is None:
+            return None
+
+        group = self.groups[frequency]
+        del group[key]
+        if not group:
+            del self.groups[frequency]
+            if self.minimum_frequency == frequency:
+                self.minimum_frequency = min(self.groups, default=0)
+        return None
+
+    def victims(self) -> Iterator[Hashable]:
+        if self.minimum_frequency in self.groups:
+            yield from self.groups[self.minimum_frequency]
+        for frequency in sorted(self.groups):
+            if frequency != self.minimum_frequency:
+                yield from self.groups[frequency]
+
+    def admit(
+            self,
+            candidate: Hashable,
+            victim: Hashable,
+    ) -> bool:
+        return True
+
+    def clear(self) -> None:
+        self.frequencies.clear()
+        self.groups.clear()
+        self.minimum_frequency = 0
+        return None
+
+
+class CountMinSketch:
+    # Approximate access counts in fixed memory. Counters saturate at 15 and
+    # are halved every `sample_size` increments, so old popularity fades.
+    def __init__(
+            self,
+            width: int,
+            depth: int = 4,
+    ) -> None:
+        self.width = max(16, 1 << (width - 1).bit_length())
+        self.depth = depth
+        self.rows = [bytearray(self.width) for _ in range(depth)]
+        self.sample_size = 10 * width
+        self.additions = 0
+        return None
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        digest = blake2b(repr(key).encode("utf-8"), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[4 * row:4 * row + 4], "little") & (self.width - 1)
+            for row in range(self.depth)
+        ]
+
+    def increment(self, key: Hashable) -> None:
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.additions //= 2
+            for row in self.rows:
+                for index in range(self.width):
+                    row[index] >>= 1
+
+        return None
+
+    def estimate(self, key: Hashable) -> int:
+        return min(
+            row[index]
+            for row, index in zip(self.rows, self._indexes(key))
+        )
+
+    def clear(self) -> None:
+        for row in self.rows:
+            row[:] = bytes(self.width)
+        self.additions = 0
+        return None
+
+
+class TinyLfuEvictionPolicy(LruEvictionPolicy):
+    # LRU eviction with a frequency filter in front of it: one-off keys (a
+    # single page of a rarely used filter) cannot push out entries that are
+    # read again and again.
+    def __init__(self, maximum_entries: int) -> None:
+        super().__init__()
+        self.sketch = CountMinSketch(width=max(maximum_entries, 1024))
+        return None
+
+    def on_access(self, key: Hashable) -> None:
+        self.sketch.increment(key)
+        return super().on_access(key)
+
+    def on_miss(self, key: Hashable) -> None:
+        self.sketch.increment(key)
+        return None
+
+    def admit(
+            self,
+            candidate: Hashable,
+            victim: Hashable,
+    ) -> bool:
+        # Ties are admitted, so with no read history this degrades to LRU.
+        return self.sketch.estimate(candidate) >= self.sketch.estimate(victim)
+
+    def clear(self) -> None:
+        super().clear()
+        self.sketch.clear()
+        return None
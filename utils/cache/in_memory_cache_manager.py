@@ -1,8 +1,48 @@
-from typing import Any
+from asyncio import (
+    get_running_loop,
+    Task,
+)
+from collections.abc import Mapping
+from heapq import (
+    heapify,
+    heappop,
+    heappush,
+)
+from sys import getsizeof
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+)
 from logging import Logger
-from datetime import datetime, timedelta
 from traceback import format_exc
 
+from .constant import EnumEvictionPolicy
+from .eviction_policy import (
+    LfuEvictionPolicy,
+    LruEvictionPolicy,
+    TinyLfuEvictionPolicy,
+)
+
+
+def estimate_size_in_bytes(value: Any) -> int:
+    # Approximate: sums sys.getsizeof over the value and everything it holds,
+    # which is enough to keep a cache of query results within a memory budget.
+    size = getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+
+    if isinstance(value, Mapping) or hasattr(value, "items"):
+        for key, item in value.items():
+            size += estimate_size_in_bytes(key) + estimate_size_in_bytes(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size_in_bytes(item)
+
+    return size
+
 
 class InMemoryCacheManager:
 
@@ -12,13 +52,59 @@ class InMemoryCacheManager:
             name: str,
             clean_up_period_in_seconds: int = 0,
             maximum_ttl_in_seconds: str = 0,
+            maximum_entries: int = 0,
+            maximum_size_in_bytes: int = 0,
+            eviction_policy: EnumEvictionPolicy = EnumEvictionPolicy.LRU,
+            maximum_concurrent_refreshes: int = 4,
     ) -> None:
         self.logger = logger
         self.clean_up_period_in_seconds = clean_up_period_in_seconds
         self.maximum_ttl_in_seconds = maximum_ttl_in_seconds
         self.name = name
+        self.maximum_entries = maximum_entries
+        self.maximum_size_in_bytes = maximum_size_in_bytes
+        self.maximum_concurrent_refreshes = maximum_concurrent_refreshes
+
+        # Expiry times are on the monotonic clock, so wall-clock jumps neither
+        # expire nor resurrect entries.
+        self.cache: dict[str, tuple[float | None, dict[str, Any]]] = dict()
 
-        self.cache: dict[str, tuple[datetime, dict[str, Any]]] = dict()
+        # Min-heap of (expires_at, key). Entries are not removed from it when
+        # their key is replaced or deleted; stale ones are skipped on pop.
+        self.expiry_heap: list[tuple[float, str]] = list()
+
+        # tag -> keys and key -> tags, so a write can drop just the entries it
+        # affects.
+        self.tags: dict[str, set[str]] = dict()
+        self.keys_tags: dict[str, tuple[str, ...]] = dict()
+
+        # Stale-while-revalidate: past its soft expiry an entry is still
+        # served, while a background task fetches a fresh value.
+        self.soft_expirations: dict[str, float] = dict()
+        self.refreshing: dict[str, Task] = dict()
+        self.invalidations = 0
+
+        # Only a bounded cache pays for bookkeeping.
+        self.eviction_policy = None
+        if maximum_entries or maximum_size_in_bytes:
+            if eviction_policy == EnumEvictionPolicy.LFU:
+                self.eviction_policy = LfuEvictionPolicy()
+            elif eviction_policy == EnumEvictionPolicy.TINY_LFU:
+                self.eviction_policy = TinyLfuEvictionPolicy(
+                    maximum_entries=maximum_entries or 1024,
+                )
+            else:
+                self.eviction_policy = LruEvictionPolicy()
+
+        self.sizes: dict[str, int] = dict()
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
         return None
 
     def clean_expired_items_cron_func(
@@ -26,22 +112,51 @@ class InMemoryCacheManager:
     ) -> None:
         self.logger.debug("Start removing expired cache from %s", self.name)
 
-        criteria = datetime.utcnow() + timedelta(seconds=self.clean_up_period_in_seconds)
+        criteria = monotonic() + self.clean_up_period_in_seconds
         try:
-            for key, value in self.cache.copy().items():
-                if value[0] < criteria:
-                    del self.cache[key]
-                    self.logger.debug(
-                        "This key '%s' is deleted from %s cache",
-                        key,
-                        self.name,
-                    )
+            removed_count = self._remove_expired(criteria=criteria)
+            self.logger.debug(
+                "%s expired items are deleted from %s cache",
+                removed_count,
+                self.name,
+            )
 
         except Exception:
             self.logger.warning(format_exc())
 
         return None
 
+    def _remove_expired(self, criteria: float) -> int:
+        # Only touches entries that are due, plus stale heap items.
+        removed_count = 0
+        while self.expiry_heap and self.expiry_heap[0][0] < criteria:
+            expires_at, key = heappop(self.expiry_heap)
+            value = self.cache.get(key)
+            if value is not None and value[0] == expires_at:
+                self._remove(key=key)
+                removed_count += 1
+
+        return removed_count
+
+    def _push_expiry(
+            self,
+            key: str,
+            expires_at: float,
+    ) -> None:
+        heappush(self.expiry_heap, (expires_at, key))
+
+        # Replaced and deleted keys leave stale items behind; rebuild once
+        # they outnumber the live entries.
+        if len(self.expiry_heap) > 2 * len(self.cache) + 1024:
+            self.expiry_heap = [
+                (value[0], key)
+                for key, value in self.cache.items()
+                if value[0] is not None
+            ]
+            heapify(self.expiry_heap)
+
+        return None
+
     def clear_cache_cron_func(
         self,
     ) -> None:
@@ -64,7 +179,10 @@ class InMemoryCacheManager:
             key: str,
     ) -> dict | None:
         if key in self.cache:
+            self._record_hit(key=key)
             return self.cache[key][1]
+
+        self._record_miss(key=key)
         return None
 
     def fetch_from_cache_with_expiration_check(
@@ -73,21 +191,32 @@ class InMemoryCacheManager:
     ) -> dict | None:
         if key in self.cache:
             value = self.cache[key]
-            if value[0] > datetime.utcnow():
+            if value[0] is None or value[0] > monotonic():
+                self._record_hit(key=key)
                 return value[1]
             else:
-                del self.cache[key]
+                self._remove(key=key)
 
+        self._record_miss(key=key)
         return None
 
     def insert_in_cache_with_expiration(
         self,
         key: str,
         value: str,
+        ttl_in_seconds: float | None = None,
+        tags: Iterable[str] = (),
     ):
-        self.cache[key] = (
-            datetime.utcnow() + timedelta(seconds=self.maximum_ttl_in_seconds),
-            value,
+        if ttl_in_seconds is None:
+            ttl_in_seconds = self.maximum_ttl_in_seconds
+
+        self._insert(
+            key=key,
+            entry=(
+                monotonic() + ttl_in_seconds,
+                value,
+            ),
+            tags=tags,
         )
 
         return None
@@ -96,13 +225,288 @@ class InMemoryCacheManager:
         self,
         key: str,
         value: str,
+        tags: Iterable[str] = (),
     ):
-        self.cache[key] = (
-            None,
-            value,
+        self._insert(
+            key=key,
+            entry=(
+                None,
+                value,
+            ),
+            tags=tags,
+        )
+
+        return None
+
+    def insert_in_cache_with_stale_while_revalidate(
+        self,
+        key: str,
+        value: Any,
+        soft_ttl_in_seconds: float,
+        hard_ttl_in_seconds: float = 0,
+        tags: Iterable[str] = (),
+    ) -> None:
+        # A hard TTL of 0 keeps the entry until it is evicted or invalidated.
+        now = monotonic()
+        self._insert(
+            key=key,
+            entry=(
+                now + hard_ttl_in_seconds if hard_ttl_in_seconds else None,
+                value,
+            ),
+            tags=tags,
+            soft_expires_at=now + soft_ttl_in_seconds,
         )
 
         return None
 
+    def fetch_from_cache_with_stale_while_revalidate(
+        self,
+        key: str,
+        refresher: Callable[[], Awaitable[Any]],
+        soft_ttl_in_seconds: float,
+        hard_ttl_in_seconds: float = 0,
+        tags: Iterable[str] = (),
+    ) -> Any | None:
+        value = self.fetch_from_cache_with_expiration_check(key=key)
+        if value is None:
+            return None
+
+        soft_expires_at = self.soft_expirations.get(key)
+        if soft_expires_at is not None and soft_expires_at <= monotonic():
+            self.stale_hits += 1
+            self._schedule_refresh(
+                key=key,
+                refresher=refresher,
+                soft_ttl_in_seconds=soft_ttl_in_seconds,
+                hard_ttl_in_seconds=hard_ttl_in_seconds,
+                tags=tags,
+            )
+
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        refresher: Callable[[], Awaitable[Any]],
+        soft_ttl_in_seconds: float,
+        hard_ttl_in_seconds: float,
+        tags: Iterable[str],
+    ) -> None:
+        # One refresh per key, and at most maximum_concurrent_refreshes at
+        # once; past the limit the stale value is served and a later read
+        # tries again.
+        if key in self.refreshing or len(self.refreshing) >= self.maximum_concurrent_refreshes:
+            return None
+
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            return None
+
+        self.refreshing[key] = loop.create_task(
+            self._refresh(
+                key=key,
+                refresher=refresher,
+                soft_ttl_in_seconds=soft_ttl_in_seconds,
+                hard_ttl_in_seconds=hard_ttl_in_seconds,
+                tags=tuple(tags),
+            )
+        )
+        return None
+
+    async def _refresh(
+        self,
+        key: str,
+        refresher: Callable[[], Awaitable[Any]],
+        soft_ttl_in_seconds: float,
+        hard_ttl_in_seconds: float,
+        tags: tuple[str, ...],
+    ) -> None:
+        invalidations = self.invalidations
+        try:
+            value = await refresher()
+
+            # A write during the refresh may have made this value stale
+            # already; leave the slot empty rather than store it.
+            if invalidations == self.invalidations:
+                self.insert_in_cache_with_stale_while_revalidate(
+                    key=key,
+                    value=value,
+                    soft_ttl_in_seconds=soft_ttl_in_seconds,
+                    hard_ttl_in_seconds=hard_ttl_in_seconds,
+                    tags=tags,
+                )
+            self.refreshes += 1
+
+        except Exception:
+            self.refresh_failures += 1
+            self.logger.warning(
+                "Refreshing key '%s' of %s cache failed: %s",
+                key,
+                self.name,
+                format_exc(),
+            )
+
+        finally:
+            self.refreshing.pop(key, None)
+
+        return None
+
     def clear_cache(self) -> None:
+        self.invalidations += 1
         self.cache.clear()
+        self.soft_expirations.clear()
+        self.sizes.clear()
+        self.size_in_bytes = 0
+        self.expiry_heap.clear()
+        self.tags.clear()
+        self.keys_tags.clear()
+        if self.eviction_policy:
+            self.eviction_policy.clear()
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        self.invalidations += 1
+        keys = set()
+        for tag in tags:
+            keys.update(self.tags.get(tag, ()))
+
+        for key in keys:
+            self._remove(key=key)
+
+        return len(keys)
+
+    def info(self) -> dict[str, int]:
+        return {
+            "entries": len(self.cache),
+            "size_in_bytes": self.size_in_bytes,
+            "maximum_entries": self.maximum_entries,
+            "maximum_size_in_bytes": self.maximum_size_in_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+    def _record_hit(self, key: str) -> None:
+        self.hits += 1
+        if self.eviction_policy:
+            self.eviction_policy.on_access(key)
+        return None
+
+    def _record_miss(self, key: str) -> None:
+        self.misses += 1
+        if self.eviction_policy:
+            self.eviction_policy.on_miss(key)
+        return None
+
+    def _remove(self, key: str) -> None:
+        self.cache.pop(key, None)
+        self.soft_expirations.pop(key, None)
+        self.size_in_bytes -= self.sizes.pop(key, 0)
+        self._unlink_tags(key=key)
+        if self.eviction_policy:
+            self.eviction_policy.on_remove(key)
+        return None
+
+    def _unlink_tags(self, key: str) -> None:
+        for tag in self.keys_tags.pop(key, ()):
+            keys = self.tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self.tags[tag]
+        return None
+
+    def _store(
+            self,
+            key: str,
+            entry: tuple[float | None, Any],
+            tags: Iterable[str],
+            soft_expires_at: float | None = None,
+    ) -> None:
+        self._unlink_tags(key=key)
+        self.cache[key] = entry
+
+        if soft_expires_at is None:
+            self.soft_expirations.pop(key, None)
+        else:
+            self.soft_expirations[key] = soft_expires_at
+
+        tags = tuple(tags)
+        if tags:
+            self.keys_tags[key] = tags
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(key)
+
+        if entry[0] is not None:
+            self._push_expiry(key=key, expires_at=entry[0])
+
+        return None
+
+    def _is_over_limit(
+            self,
+            entries: int,
+            size_in_bytes: int,
+    ) -> bool:
+        return bool(
+            (self.maximum_entries and entries > self.maximum_entries)
+            or (self.maximum_size_in_bytes and size_in_bytes > self.maximum_size_in_bytes)
+        )
+
+    def _insert(
+            self,
+            key: str,
+            entry: tuple[float | None, Any],
+            tags: Iterable[str] = (),
+            soft_expires_at: float | None = None,
+    ) -> None:
+        if not self.eviction_policy:
+            return self._store(
+                key=key,
+                entry=entry,
+                tags=tags,
+                soft_expires_at=soft_expires_at,
+            )
+
+        size = 0
+        if self.maximum_size_in_bytes:
+            size = estimate_size_in_bytes(entry[1])
+            if size > self.maximum_size_in_bytes:
+                # Never leave the previous value behind as if it were current.
+                self._remove(key=key)
+                self.rejections += 1
+                return None
+
+        # Pick the victims first, so a rejected candidate leaves the cache as
+        # it was. Replacing a key keeps its place in the policy.
+        is_new = key not in self.cache
+        victims = list()
+        entries = len(self.cache) + is_new
+        size_in_bytes = self.size_in_bytes + size - self.sizes.get(key, 0)
+        policy_victims = (victim for victim in self.eviction_policy.victims() if victim != key)
+        while self._is_over_limit(entries=entries, size_in_bytes=size_in_bytes):
+            victim = next(policy_victims)
+            # A replaced key was admitted once already.
+            if is_new and not self.eviction_policy.admit(candidate=key, victim=victim):
+                self.rejections += 1
+                return None
+            victims.append(victim)
+            entries -= 1
+            size_in_bytes -= self.sizes.get(victim, 0)
+
+        for victim in victims:
+            self._remove(key=victim)
+            self.evictions += 1
+
+        self.size_in_bytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        self.eviction_policy.on_insert(key)
+        return self._store(
+            key=key,
+            entry=entry,
+            tags=tags,
+            soft_expires_at=soft_expires_at,
+        )
@@ -1,4 +1,9 @@
 from .load_database_scripts_and_add import load_database_scripts_and_add
 from .constant import *
 from .compile_script import compile_script
-from .create_database_initialize_dict import create_database_initialize_dict
\ No newline at end of file
+from .create_database_initialize_dict import create_database_initialize_dict
+from .add_search_index_scripts import add_search_index_scripts
+from .add_datetime_report_rollup_scripts import (
+    add_datetime_report_rollup_scripts,
+    datetime_report_rollup_table_name,
+)
\ No newline at end of file
@@ -0,0 +1,112 @@
+def datetime_report_rollup_table_name(
+        table_name: str,
+        field_name: str,
+) -> str:
+    return f"{table_name}_{field_name}_daily_count"
+
+
+def add_datetime_report_rollup_scripts(
+        table_name: str,
+        field_name: str,
+        compiled_scripts: dict[str, list],
+        shard_count: int = 8,
+        is_naive_field: bool = False,
+) -> None:
+    # Every writer of a day upserts that day's row and holds its lock until
+    # commit, so one row per day would serialise concurrent writers. Each day
+    # is split into `shard_count` rows picked by backend pid instead; readers
+    # already SUM per bucket. Counts of a single shard may go negative, only
+    # their sum is meaningful.
+    rollup_table_name = datetime_report_rollup_table_name(
+        table_name=table_name,
+        field_name=field_name,
+    )
+    function_name = f"{rollup_table_name}_refresh"
+    trigger_name = f"{rollup_table_name.rpartition('.')[2]}_trigger"
+    shard = f"pg_backend_pid() % {shard_count}"
+
+    def bucket(column: str) -> str:
+        # A naive column already holds UTC wall-clock time.
+        if is_naive_field:
+            return f"DATE_TRUNC('day', {column})"
+        return f"DATE_TRUNC('day', {column} AT TIME ZONE 'UTC')"
+
+    def upsert(source: str) -> str:
+        return f"""INSERT INTO {rollup_table_name} AS rollup (bucket, shard, count)
+        {source}
+        ON CONFLICT (bucket, shard) DO UPDATE SET count = rollup.count + EXCLUDED.count;"""
+
+    compiled_scripts.setdefault("tables", list()).append(
+        f"""CREATE TABLE IF NOT EXISTS {rollup_table_name} (
+    bucket TIMESTAMP NOT NULL,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, shard)
+);"""
+    )
+
+    # Statement-level triggers with transition tables fold a whole bulk
+    # insert (or COPY) into one upsert per touched day. Transition tables
+    # cannot be combined with a column list, so updates use a row-level
+    # trigger that only fires when the field moves to another day. TRUNCATE
+    # fires no row triggers, so it empties the rollup along with the table.
+    compiled_scripts.setdefault("functions_and_triggers", list()).append(
+        f"""CREATE OR REPLACE FUNCTION {function_name}() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {upsert(f"SELECT {bucket(field_name)}, {shard}, COUNT(*) FROM new_rows WHERE {field_name} IS NOT NULL GROUP BY 1")}
+    ELSE
+        {upsert(f"SELECT {bucket(field_name)}, {shard}, -COUNT(*) FROM old_rows WHERE {field_name} IS NOT NULL GROUP BY 1")}
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+CREATE OR REPLACE FUNCTION {function_name}_update() RETURNS TRIGGER AS $$
+BEGIN
+    IF OLD.{field_name} IS NOT NULL THEN
+        {upsert(f"VALUES ({bucket(f'OLD.{field_name}')}, {shard}, -1)")}
+    END IF;
+
+    IF NEW.{field_name} IS NOT NULL THEN
+        {upsert(f"VALUES ({bucket(f'NEW.{field_name}')}, {shard}, 1)")}
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+CREATE OR REPLACE FUNCTION {function_name}_truncate() RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE {rollup_table_name};
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS {trigger_name}_insert ON {table_name};
+CREATE TRIGGER {trigger_name}_insert
+AFTER INSERT ON {table_name}
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION {function_name}();
+DROP TRIGGER IF EXISTS {trigger_name}_update ON {table_name};
+CREATE TRIGGER {trigger_name}_update
+AFTER UPDATE OF {field_name} ON {table_name}
+FOR EACH ROW
+WHEN ({bucket(f'OLD.{field_name}')} IS DISTINCT FROM {bucket(f'NEW.{field_name}')})
+EXECUTE FUNCTION {function_name}_update();
+DROP TRIGGER IF EXISTS {trigger_name}_delete ON {table_name};
+CREATE TRIGGER {trigger_name}_delete
+AFTER DELETE ON {table_name}
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION {function_name}();
+DROP TRIGGER IF EXISTS {trigger_name}_truncate ON {table_name};
+CREATE TRIGGER {trigger_name}_truncate
+AFTER TRUNCATE ON {table_name}
+FOR EACH STATEMENT EXECUTE FUNCTION {function_name}_truncate();
+INSERT INTO {rollup_table_name} (bucket, count)
+SELECT {bucket(field_name)}, COUNT(*)
+FROM {table_name}
+WHERE {field_name} IS NOT NULL
+AND NOT EXISTS (SELECT 1 FROM {rollup_table_name})
+GROUP BY 1;"""
+    )
+
+    return None
@@ -0,0 +1,35 @@
+from .constant import EnumSearchStrategy
+
+TRIGRAM_EXTENSION_SCRIPT = "CREATE EXTENSION IF NOT EXISTS pg_trgm;"
+
+
+def add_search_index_scripts(
+        table_name: str,
+        columns_names: set[str],
+        compiled_scripts: dict[str, list],
+        search_strategy: EnumSearchStrategy = EnumSearchStrategy.TRIGRAM,
+        full_text_search_configuration: str = "simple",
+) -> None:
+    index_name_prefix = table_name.replace(".", "_")
+
+    if search_strategy == EnumSearchStrategy.TRIGRAM:
+        extensions = compiled_scripts.setdefault("extensions", list())
+        if TRIGRAM_EXTENSION_SCRIPT not in extensions:
+            extensions.append(TRIGRAM_EXTENSION_SCRIPT)
+
+        for column_name in sorted(columns_names):
+            compiled_scripts.setdefault("indexes", list()).append(
+                f"CREATE INDEX IF NOT EXISTS {index_name_prefix}_{column_name}_trgm_idx "
+                f"ON {table_name} USING GIN ({column_name} gin_trgm_ops);"
+            )
+
+    elif search_strategy == EnumSearchStrategy.FULL_TEXT:
+        # The expression must match DbAction's predicate for the planner to
+        # pick the index.
+        for column_name in sorted(columns_names):
+            compiled_scripts.setdefault("indexes", list()).append(
+                f"CREATE INDEX IF NOT EXISTS {index_name_prefix}_{column_name}_tsv_idx "
+                f"ON {table_name} USING GIN (to_tsvector('{full_text_search_configuration}', {column_name}));"
+            )
+
+    return None
@@ -0,0 +1 @@
+from .db_action import DbAction
@@ -0,0 +1,89 @@
+from asyncio import (
+    current_task,
+    Lock,
+    Task,
+)
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from asyncpg import (
+    Connection,
+    Pool,
+)
+
+
+class ConnectionSession:
+    # Stands in for a Pool: every DbAction call made with the session as its
+    # `postgresql_connection_pool` runs on the same pinned connection.
+    def __init__(
+            self,
+            postgresql_connection_pool: Pool,
+            with_transact: bool = False,
+    ) -> None:
+        self.postgresql_connection_pool = postgresql_connection_pool
+        self.with_transact = with_transact
+
+        self.connection: Connection | None = None
+        self._acquire_context = None
+        self._transaction = None
+        self._lock = Lock()
+        self._owner: Task | None = None
+        self._depth = 0
+        return None
+
+    async def __aenter__(self) -> "ConnectionSession":
+        self._acquire_context = self.postgresql_connection_pool.acquire()
+        self.connection = await self._acquire_context.__aenter__()
+
+        if self.with_transact:
+            # __aexit__ does not run when __aenter__ fails, so a transaction
+            # that cannot start must hand the connection back here.
+            try:
+                self._transaction = self.connection.transaction()
+                await self._transaction.start()
+            except BaseException as error:
+                self._transaction = None
+                self.connection = None
+                await self._acquire_context.__aexit__(type(error), error, error.__traceback__)
+                raise
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if self._transaction is not None:
+                if exc_type is None:
+                    await self._transaction.commit()
+                else:
+                    await self._transaction.rollback()
+        finally:
+            self._transaction = None
+            self.connection = None
+            await self._acquire_context.__aexit__(exc_type, exc_value, traceback)
+
+        return None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Connection]:
+        # A connection runs one statement at a time; concurrent callers queue.
+        # The lock is reentrant for the task holding it, so a call made while
+        # that task is iterating a cursor on the session (iter_many,
+        # stream_by_filter) runs between two fetches instead of waiting on
+        # itself forever.
+        task = current_task()
+        if self._owner is not None and self._owner is task:
+            self._depth += 1
+            try:
+                yield self.connection
+            finally:
+                self._depth -= 1
+            return
+
+        async with self._lock:
+            self._owner = task
+            self._depth = 1
+            try:
+                yield self.connection
+            finally:
+                self._owner = None
+                self._depth = 0
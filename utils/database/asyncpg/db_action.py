@@ -1,20 +1,53 @@
+from asyncio import (
+    gather,
+    Semaphore,
+)
+from contextlib import asynccontextmanager
+from functools import partial
+from json import loads
+from time import perf_counter
 from datetime import (
     datetime,
     UTC,
 )
 from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
     Iterable,
     Any,
 )
 
+from asyncpg import Connection
 from asyncpg.pool import Pool
 from ...exception import ProjectBaseException
 from ..constant import (
     EnumOrderBy,
     MAP_ORDER_BY_SQL,
     EnumDatetimeDuration,
+    EnumPaginationCountStrategy,
+    EnumSearchStrategy,
     VALID_DURATIONS,
+    VALID_DURATIONS_PYTHON_FORMAT,
+)
+from ..datetime_bucket import (
+    fill_datetime_buckets,
+    to_naive_utc,
+    truncate_datetime,
 )
+from ..add_datetime_report_rollup_scripts import datetime_report_rollup_table_name
+from .query_cache import QueryCache
+from .connection_session import ConnectionSession
+from .routed_pool import RoutedPool
+from .pool_metrics import PoolMetrics
+from .estimated_count import EstimatedCount
+from .keyset_cursor import (
+    calculate_keyset_fingerprint,
+    encode_keyset_cursor,
+    decode_keyset_cursor,
+)
+
+WINDOW_TOTAL_COUNT_COLUMN = "__total_count"
 
 
 class DbAction:
@@ -25,12 +58,79 @@ class DbAction:
         ilike_columns_names: set[str] = set(),
         equality_columns_names: set[str] = set(),
         range_columns_names: set[str] = set(),
+        query_cache_size: int = 256,
+        pagination_count_strategy: EnumPaginationCountStrategy = EnumPaginationCountStrategy.SEPARATE,
+        search_strategy: EnumSearchStrategy = EnumSearchStrategy.ILIKE,
+        full_text_search_configuration: str = "simple",
+        columns_types: dict[str, str] = dict(),
+        pool_metrics: PoolMetrics | None = None,
+        datetime_report_rollup_fields: set[str] = set(),
+        estimated_count_threshold: int = 10000,
     ) -> None:
         self.table_name = table_name
         self.all_columns_names = all_columns_names
         self.ilike_columns_names = ilike_columns_names
         self.equality_columns_names = equality_columns_names
         self.range_columns_names = range_columns_names
+        self.pagination_count_strategy = pagination_count_strategy
+        self.search_strategy = search_strategy
+        self.full_text_search_configuration = full_text_search_configuration
+        self.columns_types = dict(columns_types)
+        self.pool_metrics = pool_metrics
+        self.datetime_report_rollup_fields = datetime_report_rollup_fields
+        self.estimated_count_threshold = estimated_count_threshold
+        self.filter_plan = self._compile_filter_plan()
+
+        # Generated SQL is memoized per query shape, so repeated calls send
+        # byte-identical text and hit asyncpg's per-connection statement cache.
+        self.query_cache = QueryCache(maximum_size=query_cache_size)
+
+    @staticmethod
+    def session(
+        postgresql_connection_pool: Pool,
+        with_transact: bool = False,
+    ) -> ConnectionSession:
+        return ConnectionSession(
+            postgresql_connection_pool=postgresql_connection_pool,
+            with_transact=with_transact,
+        )
+
+    @staticmethod
+    async def gather(
+        *awaitables: Awaitable,
+        maximum_concurrency: int = 4,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        # Each DbAction call acquires its own pool connection, so independent
+        # reads overlap; the semaphore keeps them from draining the pool.
+        if maximum_concurrency:
+            semaphore = Semaphore(maximum_concurrency)
+
+            async def run_bounded(awaitable: Awaitable) -> Any:
+                async with semaphore:
+                    return await awaitable
+
+            awaitables = tuple(run_bounded(awaitable) for awaitable in awaitables)
+
+        return list(
+            await gather(
+                *awaitables,
+                return_exceptions=return_exceptions,
+            )
+        )
+
+    @staticmethod
+    def _read_pool(postgresql_connection_pool: Pool | RoutedPool) -> Pool:
+        # Reads go to a replica; pass `routed_pool.primary` to read your writes.
+        if isinstance(postgresql_connection_pool, RoutedPool):
+            return postgresql_connection_pool.for_read()
+        return postgresql_connection_pool
+
+    def query_cache_info(self) -> dict[str, int]:
+        return self.query_cache.info()
+
+    def _returning_fields_str(self, returning_fields: set[str]) -> str:
+        return ",".join(sorted(self.all_columns_names & returning_fields))
 
     async def insert_many_without_transact(
         self,
@@ -55,6 +155,7 @@ class DbAction:
                 postgresql_connection_pool=postgresql_connection_pool,
                 query=query,
                 inputs_values=inputs_values,
+                operation="insert_many_without_transact",
             )
             total_results.extend(results)
 
@@ -85,18 +186,74 @@ class DbAction:
             returning_fields: set[str],
     ) -> Any:
         total_results = list()
-        async with postgresql_connection_pool.acquire() as connection:
+        operation = "insert_many_with_transact"
+        async with self._acquire(postgresql_connection_pool, operation) as connection:
             async with connection.transaction():
                 for batch in batches:
                     query, inputs_values = await self._build_query_for_insert_many(
                         batch=batch,
                         returning_fields=returning_fields,
                     )
-                    results = await connection.fetch(query, *inputs_values)
+                    results = await self._execute(
+                        method=connection.fetch,
+                        query=query,
+                        inputs_values=inputs_values,
+                        operation=operation,
+                    )
                     total_results.extend(results)
 
         return total_results
 
+    async def insert_many_copy(
+        self,
+        inputs_list: list[dict[str, Any]],
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str] = set(),
+    ) -> list[dict]:
+        columns = list(inputs_list[0].keys())
+        records = [
+            tuple(row[column] for column in columns)
+            for row in inputs_list
+        ]
+        schema_name, _, table_name = self.table_name.rpartition(".")
+
+        valid_returning_fields = self.all_columns_names & returning_fields
+        async with self._acquire(postgresql_connection_pool, "insert_many_copy") as connection:
+            if not valid_returning_fields:
+                await connection.copy_records_to_table(
+                    table_name,
+                    schema_name=schema_name or None,
+                    columns=columns,
+                    records=records,
+                )
+                return list()
+
+            # COPY cannot return rows, so load into a constraint-free temp
+            # table first and move the rows with a single INSERT ... SELECT.
+            # Always qualified with pg_temp: unqualified, the DROP would
+            # resolve through search_path and could hit a real table.
+            temp_table_name = f"copy_{table_name}"
+            columns_str = ", ".join(columns)
+            async with connection.transaction():
+                # Inside an outer session transaction ON COMMIT DROP waits for
+                # the outer commit, so a previous copy may still be around.
+                await connection.execute(
+                    f"""DROP TABLE IF EXISTS pg_temp.{temp_table_name};
+CREATE TEMP TABLE pg_temp.{temp_table_name} ON COMMIT DROP AS
+SELECT {columns_str} FROM {self.table_name} WITH NO DATA;"""
+                )
+                await connection.copy_records_to_table(
+                    temp_table_name,
+                    schema_name="pg_temp",
+                    columns=columns,
+                    records=records,
+                )
+                return await connection.fetch(
+                    f"""INSERT INTO {self.table_name} ({columns_str})
+SELECT {columns_str} FROM pg_temp.{temp_table_name}
+RETURNING {','.join(valid_returning_fields)};"""
+                )
+
     @staticmethod
     def calculate_batch_size(inputs_list: list[dict[str, Any]]) -> int:
         maximum_key_count = max([len(i) for i in inputs_list])
@@ -121,6 +278,7 @@ class DbAction:
             self,
             batch: list[dict],
             returning_fields: set[str],
+            on_conflict_clause: str = "",
     ) -> tuple[str, list]:
         columns = list(batch[0].keys())
         columns_str = ", ".join(columns)
@@ -139,6 +297,7 @@ class DbAction:
 
         values_placeholders_str = ", ".join(row_placeholders_list)
         query = f"INSERT INTO {self.table_name} ({columns_str}) VALUES {values_placeholders_str}"
+        query += on_conflict_clause
         valid_returning_fields = self.all_columns_names & returning_fields
         if valid_returning_fields:
             query += f" RETURNING {','.join(valid_returning_fields)};"
@@ -147,6 +306,193 @@ class DbAction:
 
         return query, inputs_values
 
+    async def update_many(
+        self,
+        inputs_list: list[dict[str, Any]],
+        postgresql_connection_pool: Pool,
+        key_columns: tuple[str, ...] = ("pid",),
+        returning_fields: set[str] = set(),
+        add_updated_at: bool = True,
+        with_transact: bool = True,
+    ) -> list[dict]:
+        if add_updated_at:
+            updated_at = datetime.now(tz=UTC)
+            inputs_list = [
+                {**inputs, "updated_at": updated_at}
+                for inputs in inputs_list
+            ]
+
+        columns_types = await self._fetch_columns_types(
+            postgresql_connection_pool=postgresql_connection_pool,
+        )
+
+        batch_size = self.calculate_batch_size(inputs_list=inputs_list)
+        queries = list()
+        for batch in self.build_batches(
+            inputs_list=inputs_list,
+            batch_size=batch_size,
+        ):
+            queries.append(
+                self._build_query_for_update_many(
+                    batch=batch,
+                    key_columns=key_columns,
+                    returning_fields=returning_fields,
+                    columns_types=columns_types,
+                )
+            )
+
+        return await self._connect_by_fetch_for_many_queries(
+            postgresql_connection_pool=postgresql_connection_pool,
+            queries=queries,
+            with_transact=with_transact,
+            operation="update_many",
+        )
+
+    def _build_query_for_update_many(
+            self,
+            batch: list[dict],
+            key_columns: tuple[str, ...],
+            returning_fields: set[str],
+            columns_types: dict[str, str],
+    ) -> tuple[str, list]:
+        columns = list(batch[0].keys())
+        num_columns = len(columns)
+
+        # Placeholders in VALUES carry no type of their own, so the first row
+        # is cast to the column types; the other rows follow it.
+        row_placeholders_list = []
+        inputs_values = []
+        for i, row in enumerate(batch):
+            placeholders = []
+            for j, col in enumerate(columns):
+                placeholder = f"${i * num_columns + j + 1}"
+                if i == 0:
+                    placeholder += f"::{columns_types[col]}"
+                placeholders.append(placeholder)
+                inputs_values.append(row[col])
+            row_placeholders_list.append("(" + ", ".join(placeholders) + ")")
+
+        set_clause = ", ".join(
+            f"{col} = source.{col}"
+            for col in columns
+            if col not in key_columns
+        )
+        join_clause = " AND ".join(
+            f"target.{col} = source.{col}"
+            for col in key_columns
+        )
+        query = (
+            f"""UPDATE {self.table_name} AS target
+SET {set_clause}
+FROM (VALUES {", ".join(row_placeholders_list)}) AS source ({", ".join(columns)})
+WHERE {join_clause}"""
+        )
+
+        valid_returning_fields = sorted(self.all_columns_names & returning_fields)
+        if valid_returning_fields:
+            query += f"\nRETURNING {','.join(f'target.{col}' for col in valid_returning_fields)};"
+        else:
+            query += ";"
+
+        return query, inputs_values
+
+    async def upsert_many(
+        self,
+        inputs_list: list[dict[str, Any]],
+        postgresql_connection_pool: Pool,
+        conflict_columns: tuple[str, ...] = ("pid",),
+        returning_fields: set[str] = set(),
+        direct_set_clause: list[str] = list(),
+        with_transact: bool = True,
+    ) -> list[dict]:
+        set_clause = [
+            f"{col} = EXCLUDED.{col}"
+            for col in inputs_list[0].keys()
+            if col not in conflict_columns
+        ]
+        set_clause.extend(direct_set_clause)
+
+        if set_clause:
+            on_conflict_clause = (
+                f" ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {', '.join(set_clause)}"
+            )
+        else:
+            on_conflict_clause = f" ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+
+        batch_size = self.calculate_batch_size(inputs_list=inputs_list)
+        queries = list()
+        for batch in self.build_batches(
+            inputs_list=inputs_list,
+            batch_size=batch_size,
+        ):
+            queries.append(
+                await self._build_query_for_insert_many(
+                    batch=batch,
+                    returning_fields=returning_fields,
+                    on_conflict_clause=on_conflict_clause,
+                )
+            )
+
+        return await self._connect_by_fetch_for_many_queries(
+            postgresql_connection_pool=postgresql_connection_pool,
+            queries=queries,
+            with_transact=with_transact,
+            operation="upsert_many",
+        )
+
+    async def _connect_by_fetch_for_many_queries(
+            self,
+            postgresql_connection_pool: Pool,
+            queries: list[tuple[str, list]],
+            with_transact: bool,
+            operation: str,
+    ) -> list[dict]:
+        total_results = list()
+        if not with_transact:
+            for query, inputs_values in queries:
+                results = await self._connect_by_fetch(
+                    postgresql_connection_pool=postgresql_connection_pool,
+                    query=query,
+                    inputs_values=inputs_values,
+                    operation=operation,
+                )
+                total_results.extend(results)
+
+            return total_results
+
+        async with self._acquire(postgresql_connection_pool, operation) as connection:
+            async with connection.transaction():
+                for query, inputs_values in queries:
+                    results = await self._execute(
+                        method=connection.fetch,
+                        query=query,
+                        inputs_values=inputs_values,
+                        operation=operation,
+                    )
+                    total_results.extend(results)
+
+        return total_results
+
+    async def _fetch_columns_types(
+            self,
+            postgresql_connection_pool: Pool,
+    ) -> dict[str, str]:
+        if not self.columns_types:
+            records = await self._connect_by_fetch(
+                postgresql_connection_pool=postgresql_connection_pool,
+                query="""SELECT attname AS column_name, format_type(atttypid, atttypmod) AS column_type
+FROM pg_attribute
+WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped;""",
+                inputs_values=(self.table_name,),
+                operation="fetch_columns_types",
+            )
+            self.columns_types = {
+                record["column_name"]: record["column_type"]
+                for record in records
+            }
+
+        return self.columns_types
+
     async def insert_one(
         self,
         inputs: dict,
@@ -173,6 +519,7 @@ VALUES ({inputs_loc_str})
             postgresql_connection_pool=postgresql_connection_pool,
             query=query,
             inputs_values=inputs_values,
+            operation="insert_one",
         )
 
     async def is_exist_or_raise(
@@ -226,16 +573,20 @@ VALUES ({inputs_loc_str})
         postgresql_connection_pool: Pool,
     ) -> bool:
 
-        query = (
-            f"""SELECT EXISTS(
+        query = self.query_cache.get_or_build(
+            key=("is_exist", where_clause),
+            builder=lambda: (
+                f"""SELECT EXISTS(
 SELECT 1 FROM {self.table_name}  
 WHERE {where_clause}
 ) As flag;"""
+            ),
         )
         result = await self._connect_by_fetch_row(
-            postgresql_connection_pool=postgresql_connection_pool,
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=query,
             inputs_values=values,
+            operation="is_exist",
         )
 
         return result['flag']
@@ -248,10 +599,35 @@ WHERE {where_clause}
         current_page: int,
         page_size: int,
     ) -> str:
+        return self.query_cache.get_or_build(
+            key=(
+                "fetch",
+                where_clause,
+                frozenset(returning_fields),
+                tuple(order_by.items()),
+                current_page,
+                page_size,
+            ),
+            builder=lambda: self._build_fetch_query(
+                where_clause=where_clause,
+                returning_fields=returning_fields,
+                order_by=order_by,
+                current_page=current_page,
+                page_size=page_size,
+            ),
+        )
+
+    def _build_fetch_query(
+        self,
+        where_clause: str,
+        returning_fields: set[str],
+        order_by: dict[str, EnumOrderBy],
+        current_page: int,
+        page_size: int,
+    ) -> str:
 
-        returning_fields = self.all_columns_names & returning_fields
-        if returning_fields:
-            returning_fields_str = ",".join(returning_fields)
+        returning_fields_str = self._returning_fields_str(returning_fields)
+        if returning_fields_str:
             query = f'SELECT {returning_fields_str}'
         else:
             query = f'SELECT *'
@@ -290,11 +666,32 @@ WHERE {where_clause}"""
         )
 
         return await self._connect_by_fetch_row(
-            postgresql_connection_pool=postgresql_connection_pool,
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=query,
             inputs_values=values,
+            operation="fetch",
+        )
+
+    async def fetch_or_raise(
+        self,
+        where_clause: str,
+        values: Iterable,
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str],
+        exception_input: dict = dict()
+    ) -> dict:
+
+        record = await self.fetch(
+            where_clause=where_clause,
+            values=values,
+            postgresql_connection_pool=postgresql_connection_pool,
+            returning_fields=returning_fields,
         )
 
+        if record is None:
+            raise ProjectBaseException(**exception_input)
+        return record
+
     async def fetch_many(
         self,
         where_clause: str,
@@ -315,11 +712,66 @@ WHERE {where_clause}"""
         )
 
         return await self._connect_by_fetch(
-            postgresql_connection_pool=postgresql_connection_pool,
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=query,
             inputs_values=values,
+            operation="fetch_many",
         )
 
+    async def iter_many(
+        self,
+        where_clause: str,
+        values: Iterable,
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str],
+        order_by: dict[str, EnumOrderBy] = dict(),
+        prefetch: int = 1000,
+    ) -> AsyncIterator[dict]:
+
+        query = self._prepare_fetch_query(
+            where_clause=where_clause,
+            returning_fields=returning_fields,
+            order_by=order_by,
+            current_page=1,
+            page_size=0,
+        )
+
+        async for record in self._connect_by_cursor(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=query,
+            inputs_values=values,
+            prefetch=prefetch,
+            operation="iter_many",
+        ):
+            yield record
+
+    async def stream_by_filter(
+        self,
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str],
+        kwargs: dict[str, Any],
+        prefetch: int = 1000,
+    ) -> AsyncIterator[dict[str, Any]]:
+
+        order_by = kwargs.pop("order_by", dict())
+        where_clause, inputs_values = self._create_where_clause(kwargs=kwargs)
+
+        fetch_query = (
+            f"""
+SELECT {",".join(self.all_columns_names & returning_fields)}
+FROM {self.table_name}
+{where_clause}{self._create_order_clause(order_by=order_by)}"""
+        )
+
+        async for record in self._connect_by_cursor(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=fetch_query,
+            inputs_values=inputs_values,
+            prefetch=prefetch,
+            operation="stream_by_filter",
+        ):
+            yield record
+
     async def update(
         self,
         inputs: dict,
@@ -335,8 +787,38 @@ WHERE {where_clause}"""
                 "updated_at": datetime.now(tz=UTC)
             }
 
+        query = self.query_cache.get_or_build(
+            key=(
+                "update",
+                tuple(inputs.keys()),
+                where_clause,
+                tuple(direct_set_clause),
+                frozenset(returning_fields),
+            ),
+            builder=lambda: self._build_update_query(
+                inputs_keys=inputs.keys(),
+                where_clause=where_clause,
+                returning_fields=returning_fields,
+                direct_set_clause=direct_set_clause,
+            ),
+        )
+
+        return await self._connect_by_fetch_row(
+            postgresql_connection_pool=postgresql_connection_pool,
+            query=query,
+            inputs_values=inputs.values(),
+            operation="update",
+        )
+
+    def _build_update_query(
+        self,
+        inputs_keys: Iterable[str],
+        where_clause: str,
+        returning_fields: set[str],
+        direct_set_clause: list[str],
+    ) -> str:
         set_clause = [f"{key}=${index}" for index,
-                      key in enumerate(inputs.keys(), start=1)]
+                      key in enumerate(inputs_keys, start=1)]
 
         if direct_set_clause:
             set_clause.extend(direct_set_clause)
@@ -348,34 +830,112 @@ SET {set_clause}
 WHERE {where_clause}"""
         )
 
-        returning_fields = self.all_columns_names & returning_fields
-        if returning_fields:
-            query += f'RETURNING {",".join(returning_fields)};'
+        returning_fields_str = self._returning_fields_str(returning_fields)
+        if returning_fields_str:
+            query += f'\nRETURNING {returning_fields_str};'
         else:
             query += ';'
 
-        return await self._connect_by_fetch_row(
-            postgresql_connection_pool=postgresql_connection_pool,
-            query=query,
-            inputs_values=inputs.values(),
-        )
+        return query
 
     async def count(
         self,
         postgresql_connection_pool: Pool,
         where_clause: str,
         values: Iterable,
+        estimated: bool = False,
     ) -> int:
-        count_query = f"SELECT COUNT(*) AS total_count FROM {self.table_name} WHERE {where_clause}"
+        count_query = self.query_cache.get_or_build(
+            key=("count", where_clause),
+            builder=lambda: f"SELECT COUNT(*) AS total_count FROM {self.table_name} WHERE {where_clause}",
+        )
+
+        if estimated:
+            return await self._estimated_count(
+                postgresql_connection_pool=postgresql_connection_pool,
+                where_clause=f"WHERE {where_clause}",
+                count_query=count_query,
+                inputs_values=values,
+                operation="count",
+            )
 
         count_result = await self._connect_by_fetch_row(
-            postgresql_connection_pool=postgresql_connection_pool,
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=count_query,
             inputs_values=values,
+            operation="count",
         )
 
         return count_result["total_count"] if count_result else 0
 
+    async def _estimated_count(
+        self,
+        postgresql_connection_pool: Pool,
+        where_clause: str,
+        count_query: str,
+        inputs_values: Iterable,
+        operation: str,
+    ) -> int:
+        estimate = await self._fetch_count_estimate(
+            postgresql_connection_pool=postgresql_connection_pool,
+            where_clause=where_clause,
+            inputs_values=inputs_values,
+            operation=operation,
+        )
+
+        # Below the threshold COUNT(*) is cheap enough, and small totals are
+        # where a wrong estimate is most visible.
+        if estimate is not None and estimate >= self.estimated_count_threshold:
+            return EstimatedCount(estimate)
+
+        count_result = await self._connect_by_fetch_row(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=count_query,
+            inputs_values=inputs_values,
+            operation=operation,
+        )
+
+        return count_result["total_count"] if count_result else 0
+
+    async def _fetch_count_estimate(
+        self,
+        postgresql_connection_pool: Pool,
+        where_clause: str,
+        inputs_values: Iterable,
+        operation: str,
+    ) -> int | None:
+        if not where_clause:
+            # reltuples is -1 until the table is first vacuumed or analyzed.
+            record = await self._connect_by_fetch_row(
+                postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+                query="SELECT reltuples::BIGINT AS estimated_count FROM pg_class WHERE oid = $1::regclass;",
+                inputs_values=(self.table_name,),
+                operation=operation,
+            )
+            if not record or record["estimated_count"] < 0:
+                return None
+            return record["estimated_count"]
+
+        explain_query = self.query_cache.get_or_build(
+            key=("explain_count", where_clause),
+            builder=lambda: f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {self.table_name} {where_clause}",
+        )
+
+        record = await self._connect_by_fetch_row(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=explain_query,
+            inputs_values=inputs_values,
+            operation=operation,
+        )
+        if not record:
+            return None
+
+        plan = record["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     async def paginated_fetch_by_filter(
         self,
         postgresql_connection_pool: Pool,
@@ -386,92 +946,340 @@ WHERE {where_clause}"""
     ) -> tuple[list[dict[str, Any]], int]:
 
         order_by = kwargs.pop("order_by")
-        returning_fields = self.all_columns_names & returning_fields
+        returning_fields_str = ",".join(self.all_columns_names & returning_fields)
 
-        fetch_query = (
-            f"""
-SELECT {','.join(returning_fields)}
-FROM {self.table_name}
-"""
+        where_clause, inputs_values = self._create_where_clause(kwargs=kwargs)
+        order_and_limit_clause = self._create_order_clause(order_by=order_by)
+        order_and_limit_clause += self._create_limit_offset_clause(
+            page_size=page_size,
+            current_page=current_page,
         )
 
         count_query = (
             f"""
 SELECT COUNT(*) AS total_count
 FROM {self.table_name}
-"""
+{where_clause}"""
         )
 
-        where_clause, inputs_values = self._create_where_clause(kwargs=kwargs)
-        fetch_query += where_clause
-        count_query += where_clause
+        if self.pagination_count_strategy == EnumPaginationCountStrategy.WINDOW:
+            return await self._paginated_fetch_with_window_count(
+                postgresql_connection_pool=postgresql_connection_pool,
+                returning_fields_str=returning_fields_str,
+                where_clause=where_clause,
+                order_and_limit_clause=order_and_limit_clause,
+                count_query=count_query,
+                inputs_values=inputs_values,
+                current_page=current_page,
+            )
 
-        fetch_query += self._create_order_clause(order_by=order_by)
-        fetch_query += self._create_limit_offset_clause(
-            page_size=page_size,
-            current_page=current_page,
+        fetch_query = (
+            f"""
+SELECT {returning_fields_str}
+FROM {self.table_name}
+{where_clause}{order_and_limit_clause}"""
         )
 
+        if self.pagination_count_strategy == EnumPaginationCountStrategy.CONCURRENT:
+            records, count = await gather(
+                self._connect_by_fetch(
+                    postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+                    query=fetch_query,
+                    inputs_values=inputs_values,
+                    operation="paginated_fetch_by_filter",
+                ),
+                self._connect_by_fetch_row(
+                    postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+                    query=count_query,
+                    inputs_values=inputs_values,
+                    operation="paginated_fetch_by_filter",
+                ),
+            )
+            return records, count["total_count"]
+
         records = await self._connect_by_fetch(
-            postgresql_connection_pool=postgresql_connection_pool,
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=fetch_query,
             inputs_values=inputs_values,
+            operation="paginated_fetch_by_filter",
         )
 
-        count = await self._connect_by_fetch(
-            postgresql_connection_pool=postgresql_connection_pool,
+        if self.pagination_count_strategy == EnumPaginationCountStrategy.ESTIMATED:
+            # Without a page size there is no LIMIT, so every row is here.
+            if page_size <= 0:
+                return records, len(records)
+
+            # A short first page already is the exact total.
+            if current_page == 1 and len(records) < page_size:
+                return records, len(records)
+
+            total = await self._estimated_count(
+                postgresql_connection_pool=postgresql_connection_pool,
+                where_clause=where_clause,
+                count_query=count_query,
+                inputs_values=inputs_values,
+                operation="paginated_fetch_by_filter",
+            )
+
+            # Never report fewer rows than the pages already served.
+            served = (current_page - 1) * page_size + len(records)
+            if isinstance(total, EstimatedCount) and total < served:
+                total = EstimatedCount(served)
+
+            return records, total
+
+        count = await self._connect_by_fetch_row(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=count_query,
             inputs_values=inputs_values,
+            operation="paginated_fetch_by_filter",
+        )
+
+        return records, count["total_count"]
+
+    async def _paginated_fetch_with_window_count(
+        self,
+        postgresql_connection_pool: Pool,
+        returning_fields_str: str,
+        where_clause: str,
+        order_and_limit_clause: str,
+        count_query: str,
+        inputs_values: list,
+        current_page: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        fetch_query = (
+            f"""
+SELECT {returning_fields_str}, COUNT(*) OVER() AS {WINDOW_TOTAL_COUNT_COLUMN}
+FROM {self.table_name}
+{where_clause}{order_and_limit_clause}"""
+        )
+
+        records = await self._connect_by_fetch(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=fetch_query,
+            inputs_values=inputs_values,
+            operation="paginated_fetch_by_filter",
+        )
+
+        if records:
+            total = records[0][WINDOW_TOTAL_COUNT_COLUMN]
+            records = [
+                {
+                    key: value
+                    for key, value in record.items()
+                    if key != WINDOW_TOTAL_COUNT_COLUMN
+                }
+                for record in records
+            ]
+            return records, total
+
+        # A page past the end carries no window value; fall back to COUNT(*).
+        if current_page > 1:
+            count = await self._connect_by_fetch_row(
+                postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+                query=count_query,
+                inputs_values=inputs_values,
+                operation="paginated_fetch_by_filter",
+            )
+            return records, count["total_count"]
+
+        return records, 0
+
+    async def keyset_fetch_by_filter(
+        self,
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str],
+        page_size: int,
+        cursor: str | None,
+        kwargs: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        if page_size < 1:
+            raise ProjectBaseException(
+                status_code=400,
+                success=False,
+                data=None,
+                message="Page size must be at least 1.",
+            )
+
+        order_by = kwargs.pop("order_by")
+        seek_columns = self._prepare_seek_columns(order_by=order_by)
+        seek_columns_names = [column for column, _ in seek_columns]
+        returning_fields_str = ",".join(
+            (self.all_columns_names & returning_fields) | {*seek_columns_names}
+        )
+
+        where_clause, inputs_values = self._create_where_clause(kwargs=kwargs)
+        fingerprint = calculate_keyset_fingerprint(
+            self.table_name,
+            seek_columns,
+            where_clause,
+            inputs_values,
+        )
+        if cursor:
+            seek_clause = self._create_seek_clause(
+                seek_columns=seek_columns,
+                counter=len(inputs_values) + 1,
+            )
+            inputs_values.extend(
+                decode_keyset_cursor(
+                    cursor=cursor,
+                    expected_length=len(seek_columns),
+                    fingerprint=fingerprint,
+                )
+            )
+            if where_clause:
+                where_clause += f" AND {seek_clause}"
+            else:
+                where_clause = f"WHERE {seek_clause}"
+
+        # One extra row tells whether another page exists.
+        fetch_query = (
+            f"""
+SELECT {returning_fields_str}
+FROM {self.table_name}
+{where_clause}{self._create_order_clause(order_by=dict(seek_columns))} LIMIT {page_size + 1}"""
+        )
+
+        records = await self._connect_by_fetch(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=fetch_query,
+            inputs_values=inputs_values,
+            operation="keyset_fetch_by_filter",
         )
 
-        return records, count[0]["total_count"]
+        if len(records) <= page_size:
+            return records, None
+
+        records = records[:page_size]
+        next_cursor = encode_keyset_cursor(
+            values=[records[-1][column] for column in seek_columns_names],
+            fingerprint=fingerprint,
+        )
+        return records, next_cursor
+
+    def _prepare_seek_columns(
+            self,
+            order_by: dict[str, EnumOrderBy],
+    ) -> list[tuple[str, EnumOrderBy]]:
+        seek_columns = [
+            (column, direction)
+            for column, direction in order_by.items()
+            if column in self.all_columns_names or column == "pid"
+        ]
+        # An explicit pid keeps its direction and place. Otherwise pid breaks
+        # ties and follows the last direction, so a uniform order still
+        # collapses into a single index-friendly row comparison.
+        if all(column != "pid" for column, _ in seek_columns):
+            pid_direction = seek_columns[-1][1] if seek_columns else EnumOrderBy.A.value
+            seek_columns.append(("pid", pid_direction))
+        return seek_columns
+
+    @staticmethod
+    def _create_seek_clause(
+            seek_columns: list[tuple[str, EnumOrderBy]],
+            counter: int,
+    ) -> str:
+        placeholders = [f"${counter + index}" for index in range(len(seek_columns))]
+        signs = [
+            ">" if MAP_ORDER_BY_SQL[direction] == "ASC" else "<"
+            for _, direction in seek_columns
+        ]
+
+        if len(set(signs)) == 1:
+            columns_str = ", ".join(column for column, _ in seek_columns)
+            return f"({columns_str}) {signs[0]} ({', '.join(placeholders)})"
+
+        or_query = list()
+        for index, (column, _) in enumerate(seek_columns):
+            and_query = [
+                f"{previous_column} = {placeholders[previous_index]}"
+                for previous_index, (previous_column, _) in enumerate(seek_columns[:index])
+            ]
+            and_query.append(f"{column} {signs[index]} {placeholders[index]}")
+            or_query.append("(" + " AND ".join(and_query) + ")")
+
+        return "(" + " OR ".join(or_query) + ")"
 
     @staticmethod
     def _remove_with_removesuffix(string: str):
         return string.removesuffix('_from').removesuffix('_to')
 
-    def _create_where_clause(
-            self,
-            kwargs: dict[str, list[Any]],
-    ) -> tuple[str, list]:
-        where_clauses = []
-        inputs_values = []
-
-        counter = 1
-        for key, values in kwargs.items():
-            if values:  # TODO: Use sentinel
+    def _compile_filter_plan(self) -> dict[str, Callable[..., int]]:
+        # Every request key that _remove_with_removesuffix can reduce to a
+        # filterable column is resolved once here, so a request costs a
+        # single dict lookup per key.
+        filter_plan = dict()
+        for column in (
+            self.ilike_columns_names
+            | self.equality_columns_names
+            | self.range_columns_names
+        ):
+            for key in (
+                column,
+                f"{column}_from",
+                f"{column}_to",
+                f"{column}_to_from",
+            ):
                 cleaned_key = self._remove_with_removesuffix(key)
                 if cleaned_key in self.ilike_columns_names:
-                    counter = self._create_where_clause_for_ilike_columns(
-                        where_clauses=where_clauses,
-                        values=values,
+                    filter_plan[key] = self._create_search_clause_builder(
                         cleaned_key=cleaned_key,
-                        counter=counter,
-                        inputs_values=inputs_values,
                     )
 
                 elif cleaned_key in self.equality_columns_names:
-                    counter = self._create_where_clause_for_equality_columns(
-                        where_clauses=where_clauses,
-                        values=values,
+                    filter_plan[key] = partial(
+                        self._create_where_clause_for_equality_columns,
                         cleaned_key=cleaned_key,
-                        counter=counter,
-                        inputs_values=inputs_values,
                     )
 
                 elif cleaned_key in self.range_columns_names:
-                    counter = self._create_where_clause_for_range_columns(
-                        where_clauses=where_clauses,
-                        values=values,
+                    filter_plan[key] = partial(
+                        self._create_where_clause_for_range_columns,
                         key=key,
                         cleaned_key=cleaned_key,
-                        counter=counter,
-                        inputs_values=inputs_values,
                     )
 
-                else:
+        return filter_plan
+
+    def _create_search_clause_builder(
+            self,
+            cleaned_key: str,
+    ) -> Callable[..., int]:
+        # pg_trgm GIN indexes serve ILIKE '%...%' as is, so TRIGRAM keeps the
+        # ILIKE predicates and only differs in the index it expects.
+        if self.search_strategy == EnumSearchStrategy.FULL_TEXT:
+            return partial(
+                self._create_where_clause_for_full_text_columns,
+                cleaned_key=cleaned_key,
+                configuration=self.full_text_search_configuration,
+            )
+
+        return partial(
+            self._create_where_clause_for_ilike_columns,
+            cleaned_key=cleaned_key,
+        )
+
+    def _create_where_clause(
+            self,
+            kwargs: dict[str, list[Any]],
+    ) -> tuple[str, list]:
+        where_clauses = []
+        inputs_values = []
+
+        counter = 1
+        for key, values in kwargs.items():
+            if values:  # TODO: Use sentinel
+                create_where_clause = self.filter_plan.get(key)
+                if create_where_clause is None:
                     continue
 
+                counter = create_where_clause(
+                    where_clauses=where_clauses,
+                    values=values,
+                    counter=counter,
+                    inputs_values=inputs_values,
+                )
+
         if where_clauses:
             return "WHERE " + " AND ".join(where_clauses), inputs_values
         return "", inputs_values
@@ -499,13 +1307,9 @@ FROM {self.table_name}
             counter: int,
             inputs_values: list[Any]
     ) -> int:
-        or_query = list()
-        for value in values:
-            or_query.append(f"{cleaned_key} = ${counter}")
-            inputs_values.append(value)
-            counter += 1
-
-        where_clauses.append("(" + " OR ".join(or_query) + ")")
+        where_clauses.append(f"{cleaned_key} = ANY(${counter})")
+        inputs_values.append(list(values))
+        counter += 1
         return counter
 
     @staticmethod
@@ -529,6 +1333,26 @@ FROM {self.table_name}
         where_clauses.append("(" + " OR ".join(or_query) + ")")
         return counter
 
+    @staticmethod
+    def _create_where_clause_for_full_text_columns(
+            where_clauses: list[str],
+            values: list[Any],
+            cleaned_key: str,
+            configuration: str,
+            counter: int,
+            inputs_values: list[Any]
+    ) -> int:
+        or_query = list()
+        for value in values:
+            or_query.append(
+                f"to_tsvector('{configuration}', {cleaned_key}) @@ plainto_tsquery('{configuration}', ${counter})"
+            )
+            inputs_values.append(value)
+            counter += 1
+
+        where_clauses.append("(" + " OR ".join(or_query) + ")")
+        return counter
+
     @staticmethod
     def _create_order_clause(order_by: dict[str, EnumOrderBy]) -> str:
         order_clauses = []
@@ -551,30 +1375,96 @@ FROM {self.table_name}
             return f" LIMIT {page_size} OFFSET {offset}"
         return ""
 
-    @staticmethod
+    @asynccontextmanager
+    async def _acquire(
+            self,
+            postgresql_connection_pool: Pool,
+            operation: str,
+    ) -> AsyncIterator[Connection]:
+        if self.pool_metrics is None:
+            async with postgresql_connection_pool.acquire() as connection:
+                yield connection
+            return
+
+        started_at = perf_counter()
+        async with postgresql_connection_pool.acquire() as connection:
+            self.pool_metrics.observe_acquire_wait(
+                table_name=self.table_name,
+                operation=operation,
+                seconds=perf_counter() - started_at,
+            )
+            yield connection
+
+    async def _execute(
+            self,
+            method: Callable[..., Awaitable],
+            query: str,
+            inputs_values: Iterable,
+            operation: str,
+    ) -> Any:
+        if self.pool_metrics is None:
+            return await method(query, *inputs_values)
+
+        started_at = perf_counter()
+        try:
+            return await method(query, *inputs_values)
+        finally:
+            self.pool_metrics.observe_execution(
+                table_name=self.table_name,
+                operation=operation,
+                query=query,
+                seconds=perf_counter() - started_at,
+            )
+
     async def _connect_by_fetch_row(
+            self,
             postgresql_connection_pool: Pool,
             query: str,
             inputs_values: Iterable = tuple(),
+            operation: str = "query",
     ) -> Any:
-        async with postgresql_connection_pool.acquire() as connection:
-            return await connection.fetchrow(
-                query,
-                *inputs_values
+        async with self._acquire(postgresql_connection_pool, operation) as connection:
+            return await self._execute(
+                method=connection.fetchrow,
+                query=query,
+                inputs_values=inputs_values,
+                operation=operation,
             )
 
-    @staticmethod
     async def _connect_by_fetch(
+            self,
             postgresql_connection_pool: Pool,
             query: str,
             inputs_values: Iterable = tuple(),
+            operation: str = "query",
     ) -> Any:
-        async with postgresql_connection_pool.acquire() as connection:
-            return await connection.fetch(
-                query,
-                *inputs_values,
+        async with self._acquire(postgresql_connection_pool, operation) as connection:
+            return await self._execute(
+                method=connection.fetch,
+                query=query,
+                inputs_values=inputs_values,
+                operation=operation,
             )
 
+    async def _connect_by_cursor(
+            self,
+            postgresql_connection_pool: Pool,
+            query: str,
+            inputs_values: Iterable = tuple(),
+            prefetch: int = 1000,
+            operation: str = "query",
+    ) -> AsyncIterator[Any]:
+        # Server-side cursors only live inside a transaction; rows arrive in
+        # chunks of `prefetch`, so memory stays flat regardless of result size.
+        async with self._acquire(postgresql_connection_pool, operation) as connection:
+            async with connection.transaction():
+                async for record in connection.cursor(
+                    query,
+                    *inputs_values,
+                    prefetch=prefetch,
+                ):
+                    yield record
+
     async def delete(
         self,
         where_clause: str,
@@ -582,61 +1472,218 @@ FROM {self.table_name}
         postgresql_connection_pool: Pool,
     ) -> dict:
 
-        query = (
-            f"""
+        query = self.query_cache.get_or_build(
+            key=("delete", where_clause),
+            builder=lambda: (
+                f"""
 DELETE FROM {self.table_name}
 WHERE {where_clause};"""
+            ),
         )
 
         return await self._connect_by_fetch_row(
             postgresql_connection_pool=postgresql_connection_pool,
             query=query,
             inputs_values=values,
+            operation="delete",
+        )
+
+    async def delete_or_raise(
+        self,
+        where_clause: str,
+        values: Iterable,
+        postgresql_connection_pool: Pool,
+        exception_input: dict = dict()
+    ) -> None:
+
+        query = self.query_cache.get_or_build(
+            key=("delete_or_raise", where_clause),
+            builder=lambda: (
+                f"""
+DELETE FROM {self.table_name}
+WHERE {where_clause}
+RETURNING TRUE AS flag;"""
+            ),
+        )
+
+        result = await self._connect_by_fetch_row(
+            postgresql_connection_pool=postgresql_connection_pool,
+            query=query,
+            inputs_values=values,
+            operation="delete_or_raise",
+        )
+
+        if result is None:
+            raise ProjectBaseException(**exception_input)
+        return None
+
+    async def delete_many_by_pids(
+        self,
+        pids: Iterable,
+        postgresql_connection_pool: Pool,
+    ) -> set[str]:
+
+        query = self.query_cache.get_or_build(
+            key=("delete_many_by_pids",),
+            builder=lambda: (
+                f"""
+DELETE FROM {self.table_name}
+WHERE pid = ANY($1)
+RETURNING pid;"""
+            ),
         )
 
+        records = await self._connect_by_fetch(
+            postgresql_connection_pool=postgresql_connection_pool,
+            query=query,
+            inputs_values=(list(pids),),
+            operation="delete_many_by_pids",
+        )
+
+        return {str(record["pid"]) for record in records}
+
     async def fetch_report_on_datetime_fields(
             self,
             postgresql_connection_pool: Pool,
             duration: EnumDatetimeDuration,
             field_name: str,
-    ):
+            from_datetime: datetime | None = None,
+            to_datetime: datetime | None = None,
+    ) -> list[dict[str, str | int]]:
+
+        trunc_value, _ = VALID_DURATIONS[duration]
+        use_rollup = self._can_use_datetime_report_rollup(
+            trunc_value=trunc_value,
+            field_name=field_name,
+            from_datetime=from_datetime,
+            to_datetime=to_datetime,
+        )
 
-        trunc_value, date_format = VALID_DURATIONS[duration]
+        # A `timestamp without time zone` column already holds naive UTC
+        # values; `AT TIME ZONE` would turn it into a timestamptz instead.
+        is_naive_field = False
+        if not use_rollup:
+            columns_types = await self._fetch_columns_types(
+                postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            )
+            is_naive_field = "without time zone" in columns_types.get(field_name, "")
 
-        query = (
+        bounds = [
+            (">=", from_datetime),
+            ("<", to_datetime),
+        ]
+        inputs_values = list()
+        for _, value in bounds:
+            if value is not None:
+                # The rollup and naive columns compare against naive UTC;
+                # a timestamptz column takes a naive bound as UTC.
+                if use_rollup or is_naive_field:
+                    value = to_naive_utc(value)
+                elif value.tzinfo is None:
+                    value = value.replace(tzinfo=UTC)
+                inputs_values.append(value)
+
+        query = self.query_cache.get_or_build(
+            key=(
+                "fetch_report_on_datetime_fields",
+                trunc_value,
+                field_name,
+                use_rollup,
+                is_naive_field,
+                from_datetime is None,
+                to_datetime is None,
+            ),
+            builder=lambda: self._build_report_query(
+                trunc_value=trunc_value,
+                field_name=field_name,
+                use_rollup=use_rollup,
+                is_naive_field=is_naive_field,
+                signs=[sign for sign, value in bounds if value is not None],
+            ),
+        )
+
+        records = await self._connect_by_fetch(
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
+            query=query,
+            inputs_values=inputs_values,
+            operation="fetch_report_on_datetime_fields",
+        )
+
+        # Buckets are keyed on naive UTC on both sides, whatever the column's
+        # type hands back.
+        return fill_datetime_buckets(
+            counts={to_naive_utc(record["period"]): record["count"] for record in records},
+            trunc_value=trunc_value,
+            date_format=VALID_DURATIONS_PYTHON_FORMAT[duration],
+            from_datetime=from_datetime,
+            to_datetime=to_datetime,
+        )
+
+    def _can_use_datetime_report_rollup(
+            self,
+            trunc_value: str,
+            field_name: str,
+            from_datetime: datetime | None,
+            to_datetime: datetime | None,
+    ) -> bool:
+        if field_name not in self.datetime_report_rollup_fields:
+            return False
+
+        # The rollup has one row per UTC day: it cannot answer hourly buckets
+        # or bounds that cut through a day.
+        if trunc_value == "hour":
+            return False
+
+        for value in (from_datetime, to_datetime):
+            if value is not None:
+                value = to_naive_utc(value)
+                if value != truncate_datetime(value=value, trunc_value="day"):
+                    return False
+
+        return True
+
+    def _build_report_query(
+            self,
+            trunc_value: str,
+            field_name: str,
+            use_rollup: bool,
+            signs: list[str],
+            is_naive_field: bool = False,
+    ) -> str:
+        # Grouping on the truncated value over a plain range predicate lets
+        # PostgreSQL range-scan an index on the field; empty buckets are
+        # filled in Python afterwards.
+        if use_rollup:
+            source = datetime_report_rollup_table_name(
+                table_name=self.table_name,
+                field_name=field_name,
+            )
+            period_column = "bucket"
+            count_expression = "SUM(count)::BIGINT"
+            where_clauses = ["count <> 0"]
+        else:
+            source = self.table_name
+            period_column = field_name if is_naive_field else f"{field_name} AT TIME ZONE 'UTC'"
+            count_expression = "COUNT(*)"
+            where_clauses = [f"{field_name} IS NOT NULL"]
+
+        bound_column = "bucket" if use_rollup else field_name
+        for index, sign in enumerate(signs, start=1):
+            where_clauses.append(f"{bound_column} {sign} ${index}")
+
+        return (
             f"""
-WITH date_range AS (
-    SELECT
-        DATE_TRUNC('{trunc_value}', MIN({field_name})) AS start_range,
-        DATE_TRUNC('{trunc_value}', MAX({field_name})) AS end_range
-    FROM
-        {self.table_name}
-),
-periods AS (
-    SELECT
-        generate_series(
-            (SELECT start_range FROM date_range),
-            (SELECT end_range FROM date_range),
-            INTERVAL '1 {trunc_value}'
-        ) AS period
-)
 SELECT
-    to_char(periods.period, '{date_format}') AS datetime,
-    COUNT({self.table_name}.pid) AS count
+    DATE_TRUNC('{trunc_value}', {period_column}) AS period,
+    {count_expression} AS count
 FROM
-    periods
-LEFT JOIN
-    {self.table_name} ON DATE_TRUNC('{trunc_value}', {self.table_name}.{field_name}) = periods.period
+    {source}
+WHERE
+    {" AND ".join(where_clauses)}
 GROUP BY
-    periods.period
+    1
 ORDER BY
-    periods.period ASC;""")
-
-        return await self._connect_by_fetch(
-            postgresql_connection_pool=postgresql_connection_pool,
-            query=query,
-            inputs_values=tuple(),
-        )
+    1;""")
 
     async def filter_then_aggregate(
         self,
@@ -676,9 +1723,10 @@ FROM {self.table_name}
         )
 
         records = await self._connect_by_fetch(
-            postgresql_connection_pool=postgresql_connection_pool,
+            postgresql_connection_pool=self._read_pool(postgresql_connection_pool),
             query=fetch_query,
             inputs_values=inputs_values,
+            operation="filter_then_aggregate",
         )
 
         return records
@@ -1,15 +1,40 @@
+from asyncio import (
+    Future,
+    get_running_loop,
+    shield,
+    wait_for,
+    CancelledError,
+)
+from datetime import datetime
+from functools import partial
+from re import (
+    compile,
+    IGNORECASE,
+)
 from typing import (
+    Awaitable,
+    Callable,
     Iterable,
     Any,
+    Sequence,
 )
 
 from asyncpg.pool import Pool
 from ...cache import InMemoryCacheManager
 from ..constant import (
     EnumDatetimeDuration,
+    EnumPaginationCountStrategy,
+    EnumSearchStrategy,
 )
 
 from .db_action import DbAction
+from .pool_metrics import PoolMetrics
+from .routed_pool import RoutedPool
+
+PID_WHERE_CLAUSE_PATTERN = compile(
+    r"^\s*(?:\w+\.)?pid\s*=\s*(?:\$(?P<index>\d+)|'(?P<literal>[^']*)')\s*;?\s*$",
+    IGNORECASE,
+)
 
 
 class DbActionWithCache(DbAction):
@@ -21,8 +46,23 @@ class DbActionWithCache(DbAction):
         ilike_columns_names: set[str] = set(),
         equality_columns_names: set[str] = set(),
         range_columns_names: set[str] = set(),
+        query_cache_size: int = 256,
+        pagination_count_strategy: EnumPaginationCountStrategy = EnumPaginationCountStrategy.SEPARATE,
+        search_strategy: EnumSearchStrategy = EnumSearchStrategy.ILIKE,
+        full_text_search_configuration: str = "simple",
+        columns_types: dict[str, str] = dict(),
+        pool_metrics: PoolMetrics | None = None,
+        datetime_report_rollup_fields: set[str] = set(),
+        estimated_count_threshold: int = 10000,
+        single_flight_timeout_in_seconds: float | None = None,
+        stale_while_revalidate_soft_ttl_in_seconds: float = 0,
+        stale_while_revalidate_hard_ttl_in_seconds: float = 0,
     ) -> None:
         self.cache_manager = cache_manager
+        self.single_flight_timeout_in_seconds = single_flight_timeout_in_seconds
+        self.stale_while_revalidate_soft_ttl_in_seconds = stale_while_revalidate_soft_ttl_in_seconds
+        self.stale_while_revalidate_hard_ttl_in_seconds = stale_while_revalidate_hard_ttl_in_seconds
+        self.in_flight: dict[str, Future] = dict()
 
         return super().__init__(
             table_name=table_name,
@@ -30,7 +70,171 @@ class DbActionWithCache(DbAction):
             ilike_columns_names=ilike_columns_names,
             equality_columns_names=equality_columns_names,
             range_columns_names=range_columns_names,
+            query_cache_size=query_cache_size,
+            pagination_count_strategy=pagination_count_strategy,
+            search_strategy=search_strategy,
+            full_text_search_configuration=full_text_search_configuration,
+            columns_types=columns_types,
+            pool_metrics=pool_metrics,
+            datetime_report_rollup_fields=datetime_report_rollup_fields,
+            estimated_count_threshold=estimated_count_threshold,
+        )
+
+    @staticmethod
+    def _read_pool(postgresql_connection_pool: Pool | RoutedPool) -> Pool:
+        # Cached entries live until the next write invalidates them, so a
+        # miss filled from a lagging replica right after that write would pin
+        # the old row indefinitely. Every read of this class goes to the
+        # primary; the cache is what takes the read load off it.
+        if isinstance(postgresql_connection_pool, RoutedPool):
+            return postgresql_connection_pool.primary
+        return postgresql_connection_pool
+
+    async def _fetch_with_cache(
+        self,
+        key: str,
+        tags: tuple[str, ...],
+        fetcher: Callable[[], Awaitable[Any]],
+        stale_while_revalidate: bool = False,
+    ) -> Any:
+        # Reports and aggregates may opt in to being served stale while a
+        # background task refreshes them; writes still invalidate them.
+        stale_while_revalidate = bool(
+            stale_while_revalidate and self.stale_while_revalidate_soft_ttl_in_seconds
+        )
+
+        if stale_while_revalidate:
+            value = self.cache_manager.fetch_from_cache_with_stale_while_revalidate(
+                key=key,
+                refresher=fetcher,
+                soft_ttl_in_seconds=self.stale_while_revalidate_soft_ttl_in_seconds,
+                hard_ttl_in_seconds=self.stale_while_revalidate_hard_ttl_in_seconds,
+                tags=tags,
+            )
+        else:
+            value = self.cache_manager.fetch_from_cache_without_expiration_check(
+                key=key
+            )
+        if value:
+            return value
+
+        # Single flight: concurrent misses on one key share the first query
+        # instead of all reaching PostgreSQL.
+        future = self.in_flight.get(key)
+        if future is not None:
+            try:
+                return await wait_for(
+                    shield(future),
+                    timeout=self.single_flight_timeout_in_seconds,
+                )
+            except TimeoutError:
+                # Waited long enough on a slow query; run our own.
+                return await fetcher()
+            except CancelledError:
+                if not future.cancelled():
+                    raise
+                return await fetcher()
+
+        future = get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            records = await fetcher()
+            if stale_while_revalidate:
+                self.cache_manager.insert_in_cache_with_stale_while_revalidate(
+                    key=key,
+                    value=records,
+                    soft_ttl_in_seconds=self.stale_while_revalidate_soft_ttl_in_seconds,
+                    hard_ttl_in_seconds=self.stale_while_revalidate_hard_ttl_in_seconds,
+                    tags=tags,
+                )
+            else:
+                self.cache_manager.insert_in_cache_without_expiration(
+                    key=key,
+                    value=records,
+                    tags=tags,
+                )
+            future.set_result(records)
+        except Exception as error:
+            future.set_exception(error)
+            # Mark it retrieved: with no waiters asyncio would warn about it.
+            future.exception()
+            raise
+        finally:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+            # Cancelled leader: waiters run the query themselves.
+            if not future.done():
+                future.cancel()
+
+        return records
+
+    # Every entry carries the table tag. Single-row fetches by pid also carry
+    # a pid tag; anything else that may contain several rows carries the list
+    # tag. Writes drop only the tags they can affect.
+    def _list_tag(self) -> str:
+        return f"{self.table_name}:list"
+
+    def _pid_tag(self, pid: Any) -> str:
+        return f"{self.table_name}:pid:{pid}"
+
+    # Callers materialise `values` once: a generator would be consumed by the
+    # first of the cache key, the tags and the query.
+    @staticmethod
+    def _derive_pid(
+        where_clause: str,
+        values: Sequence,
+    ) -> str | None:
+        match = PID_WHERE_CLAUSE_PATTERN.match(where_clause)
+        if not match:
+            return None
+
+        if match["literal"] is not None:
+            return match["literal"]
+
+        index = int(match["index"]) - 1
+        if index >= len(values):
+            return None
+
+        return str(values[index])
+
+    def _tags_for(
+        self,
+        where_clause: str,
+        values: Sequence,
+    ) -> tuple[str, ...]:
+        pid = self._derive_pid(where_clause=where_clause, values=values)
+        if pid is None:
+            return (self.table_name, self._list_tag())
+        return (self.table_name, self._pid_tag(pid))
+
+    def _list_tags(self) -> tuple[str, ...]:
+        return (self.table_name, self._list_tag())
+
+    def _invalidate_table(self) -> None:
+        self.cache_manager.invalidate_tags(tags=(self.table_name,))
+        return None
+
+    def _invalidate_lists(self) -> None:
+        self.cache_manager.invalidate_tags(tags=(self._list_tag(),))
+        return None
+
+    def _invalidate_pids(self, pids: Iterable) -> None:
+        self.cache_manager.invalidate_tags(
+            tags=(self._list_tag(), *(self._pid_tag(pid) for pid in pids)),
         )
+        return None
+
+    def _invalidate_rows(
+        self,
+        where_clause: str,
+        values: Sequence,
+    ) -> None:
+        pid = self._derive_pid(where_clause=where_clause, values=values)
+        if pid is None:
+            self._invalidate_table()
+        else:
+            self._invalidate_pids(pids=(pid,))
+        return None
 
     async def insert_many_without_transact(
         self,
@@ -43,7 +247,7 @@ class DbActionWithCache(DbAction):
             postgresql_connection_pool=postgresql_connection_pool,
             returning_fields=returning_fields,
         )
-        self.cache_manager.clear_cache()
+        self._invalidate_lists()
         return records
 
 
@@ -58,7 +262,64 @@ class DbActionWithCache(DbAction):
             postgresql_connection_pool=postgresql_connection_pool,
             returning_fields=returning_fields,
         )
-        self.cache_manager.clear_cache()
+        self._invalidate_lists()
+        return records
+
+    async def insert_many_copy(
+        self,
+        inputs_list: list[dict[str, Any]],
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str] = set(),
+    ) -> list[dict]:
+        records = await super().insert_many_copy(
+            inputs_list=inputs_list,
+            postgresql_connection_pool=postgresql_connection_pool,
+            returning_fields=returning_fields,
+        )
+        self._invalidate_lists()
+        return records
+
+    async def update_many(
+        self,
+        inputs_list: list[dict[str, Any]],
+        postgresql_connection_pool: Pool,
+        key_columns: tuple[str, ...] = ("pid",),
+        returning_fields: set[str] = set(),
+        add_updated_at: bool = True,
+        with_transact: bool = True,
+    ) -> list[dict]:
+        records = await super().update_many(
+            inputs_list=inputs_list,
+            postgresql_connection_pool=postgresql_connection_pool,
+            key_columns=key_columns,
+            returning_fields=returning_fields,
+            add_updated_at=add_updated_at,
+            with_transact=with_transact,
+        )
+        if tuple(key_columns) == ("pid",):
+            self._invalidate_pids(pids=(inputs["pid"] for inputs in inputs_list))
+        else:
+            self._invalidate_table()
+        return records
+
+    async def upsert_many(
+        self,
+        inputs_list: list[dict[str, Any]],
+        postgresql_connection_pool: Pool,
+        conflict_columns: tuple[str, ...] = ("pid",),
+        returning_fields: set[str] = set(),
+        direct_set_clause: list[str] = list(),
+        with_transact: bool = True,
+    ) -> list[dict]:
+        records = await super().upsert_many(
+            inputs_list=inputs_list,
+            postgresql_connection_pool=postgresql_connection_pool,
+            conflict_columns=conflict_columns,
+            returning_fields=returning_fields,
+            direct_set_clause=direct_set_clause,
+            with_transact=with_transact,
+        )
+        self._invalidate_table()
         return records
 
     async def insert_one(
@@ -72,7 +333,7 @@ class DbActionWithCache(DbAction):
             postgresql_connection_pool=postgresql_connection_pool,
             returning_fields=returning_fields,
         )
-        self.cache_manager.clear_cache()
+        self._invalidate_lists()
         return records
 
 
@@ -83,27 +344,20 @@ class DbActionWithCache(DbAction):
         postgresql_connection_pool: Pool,
         returning_fields: set[str],
     ) -> dict:
+        values = list(values)
         key = f"{self.table_name}:fetch:{where_clause}:{values}:{returning_fields}"
-        value = self.cache_manager.fetch_from_cache_without_expiration_check(
-            key=key
-        )
-        if value:
-            return value
-        
-        records = await super().fetch(
-            where_clause=where_clause,
-            values=values,
-            postgresql_connection_pool=postgresql_connection_pool,
-            returning_fields=returning_fields,
-        )
-
-        self.cache_manager.insert_in_cache_without_expiration(
+        return await self._fetch_with_cache(
             key=key,
-            value=records,
+            tags=self._tags_for(where_clause=where_clause, values=values),
+            fetcher=partial(
+                super().fetch,
+                where_clause=where_clause,
+                values=values,
+                postgresql_connection_pool=postgresql_connection_pool,
+                returning_fields=returning_fields,
+            ),
         )
 
-        return records
-
     async def fetch_many(
         self,
         where_clause: str,
@@ -111,41 +365,38 @@ class DbActionWithCache(DbAction):
         postgresql_connection_pool: Pool,
         returning_fields: set[str],
     ) -> list[dict]:
+        values = list(values)
         key = f"{self.table_name}:fetch_many:{where_clause}:{values}:{returning_fields}"
-        value = self.cache_manager.fetch_from_cache_without_expiration_check(
-            key=key
-        )
-        if value:
-            return value
-        
-        records = await super().fetch_many(
-            where_clause=where_clause,
-            values=values,
-            postgresql_connection_pool=postgresql_connection_pool,
-            returning_fields=returning_fields,
-        )
-
-        self.cache_manager.insert_in_cache_without_expiration(
+        return await self._fetch_with_cache(
             key=key,
-            value=records,
+            tags=self._list_tags(),
+            fetcher=partial(
+                super().fetch_many,
+                where_clause=where_clause,
+                values=values,
+                postgresql_connection_pool=postgresql_connection_pool,
+                returning_fields=returning_fields,
+            ),
         )
 
-        return records
-
     async def update(
         self,
         inputs: dict,
         where_clause: str,
         postgresql_connection_pool: Pool,
         returning_fields: set[str] = set(),
+        direct_set_clause: list[str] = list(),
+        add_updated_at: bool = True,
     ) -> dict | None:
         records = await super().update(
             inputs=inputs,
             where_clause=where_clause,
             postgresql_connection_pool=postgresql_connection_pool,
             returning_fields=returning_fields,
+            direct_set_clause=direct_set_clause,
+            add_updated_at=add_updated_at,
         )
-        self.cache_manager.clear_cache()
+        self._invalidate_rows(where_clause=where_clause, values=list(inputs.values()))
         return records
 
     async def paginated_fetch_by_filter(
@@ -157,27 +408,41 @@ class DbActionWithCache(DbAction):
         kwargs: dict[str, Any]
     ) -> tuple[list[dict[str, Any]], int]:
         key = f"{self.table_name}:paginated_fetch_by_filter:{returning_fields}:{current_page}:{page_size}:{kwargs}"
-        value = self.cache_manager.fetch_from_cache_without_expiration_check(
-            key=key
-        )
-        if value:
-            return value
-        
-        records = await super().paginated_fetch_by_filter(
-            current_page=current_page,
-            page_size=page_size,
-            kwargs=kwargs,
-            postgresql_connection_pool=postgresql_connection_pool,
-            returning_fields=returning_fields,
+        return await self._fetch_with_cache(
+            key=key,
+            tags=self._list_tags(),
+            fetcher=partial(
+                super().paginated_fetch_by_filter,
+                current_page=current_page,
+                page_size=page_size,
+                kwargs=kwargs,
+                postgresql_connection_pool=postgresql_connection_pool,
+                returning_fields=returning_fields,
+            ),
         )
 
-        self.cache_manager.insert_in_cache_without_expiration(
+    async def keyset_fetch_by_filter(
+        self,
+        postgresql_connection_pool: Pool,
+        returning_fields: set[str],
+        page_size: int,
+        cursor: str | None,
+        kwargs: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        key = f"{self.table_name}:keyset_fetch_by_filter:{returning_fields}:{page_size}:{cursor}:{kwargs}"
+        return await self._fetch_with_cache(
             key=key,
-            value=records,
+            tags=self._list_tags(),
+            fetcher=partial(
+                super().keyset_fetch_by_filter,
+                postgresql_connection_pool=postgresql_connection_pool,
+                returning_fields=returning_fields,
+                page_size=page_size,
+                cursor=cursor,
+                kwargs=kwargs,
+            ),
         )
 
-        return records
-
 
     async def delete(
         self,
@@ -185,40 +450,69 @@ class DbActionWithCache(DbAction):
         values: Iterable,
         postgresql_connection_pool: Pool,
     ) -> dict:
+        values = list(values)
         records = await super().delete(
             where_clause=where_clause,
             values=values,
             postgresql_connection_pool=postgresql_connection_pool,
         )
-        self.cache_manager.clear_cache()
+        self._invalidate_rows(where_clause=where_clause, values=values)
         return records
 
+    async def delete_or_raise(
+        self,
+        where_clause: str,
+        values: Iterable,
+        postgresql_connection_pool: Pool,
+        exception_input: dict = dict()
+    ) -> None:
+        values = list(values)
+        try:
+            await super().delete_or_raise(
+                where_clause=where_clause,
+                values=values,
+                postgresql_connection_pool=postgresql_connection_pool,
+                exception_input=exception_input,
+            )
+        finally:
+            self._invalidate_rows(where_clause=where_clause, values=values)
+        return None
+
+    async def delete_many_by_pids(
+        self,
+        pids: Iterable,
+        postgresql_connection_pool: Pool,
+    ) -> set[str]:
+        deleted_pids = await super().delete_many_by_pids(
+            pids=pids,
+            postgresql_connection_pool=postgresql_connection_pool,
+        )
+        self._invalidate_pids(pids=deleted_pids)
+        return deleted_pids
+
     async def fetch_report_on_datetime_fields(
             self,
             postgresql_connection_pool: Pool,
             duration: EnumDatetimeDuration,
             field_name: str,
-    ):
-        key = f"{self.table_name}:fetch_report_on_datetime_fields:{duration}:{field_name}"
-        value = self.cache_manager.fetch_from_cache_without_expiration_check(
-            key=key
-        )
-        if value:
-            return value
-        
-        records = await super().fetch_report_on_datetime_fields(
-            duration=duration,
-            field_name=field_name,
-            postgresql_connection_pool=postgresql_connection_pool,
-        )
-
-        self.cache_manager.insert_in_cache_without_expiration(
+            from_datetime: datetime | None = None,
+            to_datetime: datetime | None = None,
+    ) -> list[dict[str, str | int]]:
+        key = f"{self.table_name}:fetch_report_on_datetime_fields:{duration}:{field_name}:{from_datetime}:{to_datetime}"
+        return await self._fetch_with_cache(
             key=key,
-            value=records,
+            tags=self._list_tags(),
+            fetcher=partial(
+                super().fetch_report_on_datetime_fields,
+                duration=duration,
+                field_name=field_name,
+                postgresql_connection_pool=postgresql_connection_pool,
+                from_datetime=from_datetime,
+                to_datetime=to_datetime,
+            ),
+            stale_while_revalidate=True,
         )
 
-        return records
-
     async def filter_then_aggregate(
         self,
         postgresql_connection_pool: Pool,
@@ -230,23 +524,23 @@ class DbActionWithCache(DbAction):
         aggregation_variable_name: set[str], 
     ) -> list[dict[str, Any]]:
         key = f"{self.table_name}:filter_then_aggregate:{group_by_on_fields}:{current_page}:{page_size}:{kwargs}:{aggregation_in_select}"
-        value = self.cache_manager.fetch_from_cache_without_expiration_check(key=key)
-        if value:
-            return value
 
-        records = await super().filter_then_aggregate(
-            postgresql_connection_pool=postgresql_connection_pool,
-            group_by_on_fields=group_by_on_fields,
-            current_page=current_page,
-            page_size=page_size,
-            kwargs=kwargs,
-            aggregation_in_select=aggregation_in_select, 
-            aggregation_variable_name=aggregation_variable_name, 
-        )
+        # The base pops order_by from kwargs, and a background refresh calls
+        # this again, so every call gets its own copy.
+        async def fetcher() -> list[dict[str, Any]]:
+            return await super(DbActionWithCache, self).filter_then_aggregate(
+                postgresql_connection_pool=postgresql_connection_pool,
+                group_by_on_fields=group_by_on_fields,
+                current_page=current_page,
+                page_size=page_size,
+                kwargs=dict(kwargs),
+                aggregation_in_select=aggregation_in_select,
+                aggregation_variable_name=aggregation_variable_name,
+            )
 
-        self.cache_manager.insert_in_cache_without_expiration(
+        return await self._fetch_with_cache(
             key=key,
-            value=records,
+            tags=self._list_tags(),
+            fetcher=fetcher,
+            stale_while_revalidate=True,
         )
-
-        return records
\ No newline at end of file
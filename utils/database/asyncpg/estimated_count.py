@@ -0,0 +1,4 @@
+# A row count taken from planner statistics rather than COUNT(*). It behaves as
+# a plain int; callers tell it apart with isinstance(total, EstimatedCount).
+class EstimatedCount(int):
+    pass
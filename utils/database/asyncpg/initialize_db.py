@@ -1,9 +1,15 @@
+from asyncio import gather
+
 from asyncpg import (
     create_pool,
     Pool,
 )
 from fastapi import FastAPI
 
+from ..constant import EnumReplicaSelection
+from .routed_pool import RoutedPool
+from .pool_metrics import PoolMetrics
+
 
 async def initialize_db(
         app: FastAPI,
@@ -13,15 +19,46 @@ async def initialize_db(
         maximum_queries_to_restart_connection: int,
         maximum_inactive_connection_lifetime_in_second: int,
         attr_name: str = "pool",
-        ) -> Pool:
+        maximum_cached_statements_per_connection: int = 100,
+        replica_connection_strings: list[str] = list(),
+        replica_selection: EnumReplicaSelection = EnumReplicaSelection.ROUND_ROBIN,
+        pool_metrics: PoolMetrics | None = None,
+        ) -> Pool | RoutedPool:
     
-    pool = await create_pool(
-        dsn=connection_string,
-        min_size=minimum_number_of_connection,
-        max_size=maximum_number_of_connection,
-        max_queries=maximum_queries_to_restart_connection,
-        max_inactive_connection_lifetime=maximum_inactive_connection_lifetime_in_second,
-    )
+    pools = list()
+    try:
+        for dsn in (connection_string, *replica_connection_strings):
+            pools.append(
+                await create_pool(
+                    dsn=dsn,
+                    min_size=minimum_number_of_connection,
+                    max_size=maximum_number_of_connection,
+                    max_queries=maximum_queries_to_restart_connection,
+                    max_inactive_connection_lifetime=maximum_inactive_connection_lifetime_in_second,
+                    statement_cache_size=maximum_cached_statements_per_connection,
+                )
+            )
+    except BaseException:
+        # An unreachable replica must not leak the pools opened before it.
+        await gather(
+            *(created_pool.close() for created_pool in pools),
+            return_exceptions=True,
+        )
+        raise
+
+    if pool_metrics:
+        pool_metrics.register_pool(name=attr_name, pool=pools[0])
+        for index, replica_pool in enumerate(pools[1:]):
+            pool_metrics.register_pool(name=f"{attr_name}_replica_{index}", pool=replica_pool)
+
+    if replica_connection_strings:
+        pool = RoutedPool(
+            primary=pools[0],
+            replicas=pools[1:],
+            replica_selection=replica_selection,
+        )
+    else:
+        pool = pools[0]
 
     setattr(app.state, attr_name, pool)
 
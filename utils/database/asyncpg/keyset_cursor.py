@@ -0,0 +1,116 @@
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode,
+)
+from binascii import Error as BinasciiError
+from datetime import (
+    date,
+    datetime,
+    time,
+)
+from decimal import Decimal
+from hashlib import sha256
+from json import (
+    dumps,
+    loads,
+)
+from typing import Any
+from uuid import UUID
+
+from ...exception import ProjectBaseException
+
+# JSON has no native type for these, so they are tagged to round-trip exactly
+# and reach asyncpg with the type the column codec expects.
+ENCODERS = (
+    (datetime, "dt", datetime.isoformat),
+    (date, "d", date.isoformat),
+    (time, "t", time.isoformat),
+    (UUID, "u", str),
+    (Decimal, "n", str),
+)
+
+DECODERS = {
+    "dt": datetime.fromisoformat,
+    "d": date.fromisoformat,
+    "t": time.fromisoformat,
+    "u": UUID,
+    "n": Decimal,
+}
+
+
+def _encode_value(value: Any) -> Any:
+    for type_, tag, encoder in ENCODERS:
+        if isinstance(value, type_):
+            return {tag: encoder(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        (tag, raw), = value.items()
+        return DECODERS[tag](raw)
+    if isinstance(value, list):
+        raise TypeError("Nested values are not valid cursor values.")
+    return value
+
+
+def _encode_fingerprint_value(value: Any) -> Any:
+    encoded = _encode_value(value)
+    return str(value) if encoded is value else encoded
+
+
+def calculate_keyset_fingerprint(*parts: Any) -> str:
+    # Ties a cursor to the order and filter it was issued for; a cursor from
+    # another query would otherwise seek into an unrelated result set.
+    payload = dumps(
+        parts,
+        separators=(",", ":"),
+        default=_encode_fingerprint_value,
+    )
+    return sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_keyset_cursor(
+        values: list[Any],
+        fingerprint: str,
+) -> str:
+    payload = dumps(
+        {
+            "f": fingerprint,
+            "v": [_encode_value(value) for value in values],
+        },
+        separators=(",", ":"),
+    )
+    return urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_keyset_cursor(
+        cursor: str,
+        expected_length: int,
+        fingerprint: str,
+) -> list[Any]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = loads(urlsafe_b64decode(cursor + padding))
+        if (
+            isinstance(payload, dict)
+            and payload.keys() == {"f", "v"}
+            and payload["f"] == fingerprint
+            and isinstance(payload["v"], list)
+            and len(payload["v"]) == expected_length
+        ):
+            values = [_decode_value(value) for value in payload["v"]]
+        else:
+            values = None
+    except (AttributeError, BinasciiError, ValueError, TypeError, KeyError):
+        values = None
+
+    if values is None:
+        raise ProjectBaseException(
+            status_code=400,
+            success=False,
+            data=None,
+            message="Cursor is not valid.",
+        )
+
+    return values
@@ -0,0 +1,255 @@
+from asyncio import gather
+from hashlib import sha256
+from logging import Logger
+from re import (
+    compile,
+    DOTALL,
+    IGNORECASE,
+)
+from time import perf_counter
+from traceback import format_exc
+from typing import Any
+
+from asyncpg import (
+    create_pool,
+    Pool,
+)
+
+from ..sql_statements import split_sql_statements
+from .code_name_running_priority import CODE_NAME_RUNNING_PRIORITY
+
+CREATE_INDEX_PATTERN = compile(
+    r"^((?:\s*(?:--[^\n]*\n|/\*.*?\*/))*\s*CREATE\s+(?:UNIQUE\s+)?INDEX)(?!\s+CONCURRENTLY\b)",
+    IGNORECASE | DOTALL,
+)
+
+CONCURRENT_INDEX_NAME_PATTERN = compile(
+    r"\bCREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"(?!ON\b)((?:\"[^\"]+\"|[\w$]+)(?:\.(?:\"[^\"]+\"|[\w$]+))?)",
+    IGNORECASE,
+)
+
+
+def _make_index_concurrent(statement: str) -> str:
+    return CREATE_INDEX_PATTERN.sub(r"\1 CONCURRENTLY", statement, count=1)
+
+
+def _find_concurrent_index_name(statement: str) -> str | None:
+    # Unnamed indexes get a generated name, so they cannot be looked up here.
+    match = CONCURRENT_INDEX_NAME_PATTERN.search(statement)
+    return match.group(1) if match else None
+
+
+def _calculate_checksum(
+        code_name: str,
+        sql: str,
+) -> str:
+    return sha256(f"{code_name}\0{sql}".encode("utf-8")).hexdigest()
+
+
+async def parallel_setup_database(
+        connection_string: str,
+        sqls: dict[str, list[str]],
+        logger: Logger,
+        code_name_running_priority: list[str] = CODE_NAME_RUNNING_PRIORITY,
+        maximum_number_of_connection: int = 4,
+        parallel_code_names: set[str] = {"indexes"},
+        concurrent_index_code_names: set[str] = {"indexes"},
+        tracking_table_name: str = "database_setup_script",
+        skip_unchanged_scripts: bool = True,
+) -> list[dict[str, Any]]:
+    print(
+        """
+==================================================================================
+                        <<<<<< DATABASE SETUP >>>>>>
+==================================================================================
+""",
+        flush=True,
+    )
+    timings = list()
+
+    try:
+        async with create_pool(
+            dsn=connection_string,
+            min_size=1,
+            max_size=maximum_number_of_connection,
+        ) as pool:
+            async with pool.acquire() as connection:
+                await connection.execute(
+                    f"""
+CREATE TABLE IF NOT EXISTS {tracking_table_name} (
+    checksum TEXT PRIMARY KEY,
+    code_name TEXT NOT NULL,
+    duration_in_seconds DOUBLE PRECISION NOT NULL,
+    executed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);"""
+                )
+                records = await connection.fetch(f"SELECT checksum FROM {tracking_table_name};")
+            executed_checksums = {record["checksum"] for record in records}
+
+            # Phases stay in priority order, since each one depends on the ones
+            # before it; only scripts inside a parallel phase run side by side.
+            for code_name in code_name_running_priority:
+                if not sqls.get(code_name):
+                    logger.info("No SQL scripts found for '%s', skipping.", code_name)
+                    continue
+
+                # Loaded scripts arrive one line per element, so the phase is
+                # rebuilt whole before anything is split or checksummed.
+                compiled_sql = "\n".join(sqls[code_name])
+                if code_name in concurrent_index_code_names:
+                    # CREATE INDEX CONCURRENTLY cannot share a transaction, so
+                    # every statement is sent on its own.
+                    scripts = [
+                        _make_index_concurrent(statement)
+                        for statement in split_sql_statements(compiled_sql)
+                    ]
+                elif code_name in parallel_code_names:
+                    scripts = split_sql_statements(compiled_sql)
+                else:
+                    scripts = [compiled_sql]
+
+                pending_scripts = list()
+                for script in scripts:
+                    checksum = _calculate_checksum(code_name=code_name, sql=script)
+                    if skip_unchanged_scripts and checksum in executed_checksums:
+                        timings.append(
+                            {
+                                "code_name": code_name,
+                                "checksum": checksum,
+                                "duration_in_seconds": 0.0,
+                                "skipped": True,
+                            }
+                        )
+                        continue
+                    pending_scripts.append((checksum, script))
+
+                logger.info(
+                    "Executing SQL for '%s': %d scripts, %d unchanged ...",
+                    code_name,
+                    len(pending_scripts),
+                    len(scripts) - len(pending_scripts),
+                )
+
+                if code_name in parallel_code_names:
+                    # Let every started script finish before failing, so no
+                    # index build is cut off halfway.
+                    results = await gather(
+                        *(
+                            _execute_script(
+                                pool=pool,
+                                code_name=code_name,
+                                checksum=checksum,
+                                script=script,
+                                tracking_table_name=tracking_table_name,
+                                logger=logger,
+                            )
+                            for checksum, script in pending_scripts
+                        ),
+                        return_exceptions=True,
+                    )
+                    for result in results:
+                        if isinstance(result, BaseException):
+                            raise result
+                    timings.extend(results)
+
+                else:
+                    for checksum, script in pending_scripts:
+                        timings.append(
+                            await _execute_script(
+                                pool=pool,
+                                code_name=code_name,
+                                checksum=checksum,
+                                script=script,
+                                tracking_table_name=tracking_table_name,
+                                logger=logger,
+                            )
+                        )
+
+    except Exception:
+        logger.critical(format_exc())
+        raise
+
+    return timings
+
+
+async def _execute_script(
+        pool: Pool,
+        code_name: str,
+        checksum: str,
+        script: str,
+        tracking_table_name: str,
+        logger: Logger,
+) -> dict[str, Any]:
+    index_name = _find_concurrent_index_name(script)
+
+    async with pool.acquire() as connection:
+        start = perf_counter()
+        try:
+            await connection.execute(script)
+        except Exception:
+            logger.error("Error executing '%s' script %s.", code_name, checksum[:12])
+            # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+            # which a rerun with IF NOT EXISTS would silently keep.
+            if index_name:
+                try:
+                    await _drop_invalid_index(
+                        connection=connection,
+                        index_name=index_name,
+                        logger=logger,
+                    )
+                except Exception:
+                    logger.error(format_exc())
+            raise
+        duration_in_seconds = perf_counter() - start
+
+        if index_name and await _drop_invalid_index(
+                connection=connection,
+                index_name=index_name,
+                logger=logger,
+        ):
+            raise RuntimeError(
+                f"Index {index_name} of '{code_name}' script {checksum[:12]} was left invalid."
+            )
+
+        await connection.execute(
+            f"""
+INSERT INTO {tracking_table_name} (checksum, code_name, duration_in_seconds)
+VALUES ($1, $2, $3)
+ON CONFLICT (checksum) DO UPDATE
+SET duration_in_seconds = EXCLUDED.duration_in_seconds, executed_at = NOW();""",
+            checksum,
+            code_name,
+            duration_in_seconds,
+        )
+
+    logger.info(
+        "Executed '%s' script %s in %.3f seconds.",
+        code_name,
+        checksum[:12],
+        duration_in_seconds,
+    )
+
+    return {
+        "code_name": code_name,
+        "checksum": checksum,
+        "duration_in_seconds": duration_in_seconds,
+        "skipped": False,
+    }
+
+
+async def _drop_invalid_index(
+        connection,
+        index_name: str,
+        logger: Logger,
+) -> bool:
+    is_invalid = await connection.fetchval(
+        "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1);",
+        index_name,
+    )
+    if not is_invalid:
+        return False
+
+    logger.warning("Dropping invalid index %s.", index_name)
+    await connection.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
+    return True
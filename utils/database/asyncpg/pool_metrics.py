@@ -0,0 +1,169 @@
+from bisect import bisect_left
+from logging import Logger
+
+from asyncpg import Pool
+
+DEFAULT_BUCKETS_IN_SECONDS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+ACQUIRE_WAIT_METRIC_NAME = "db_action_acquire_wait_seconds"
+EXECUTION_METRIC_NAME = "db_action_execution_seconds"
+
+METRICS_HELP = {
+    ACQUIRE_WAIT_METRIC_NAME: "Time spent waiting in pool.acquire().",
+    EXECUTION_METRIC_NAME: "Time spent executing a DbAction statement.",
+}
+
+
+class Histogram:
+    def __init__(
+            self,
+            buckets: tuple[float, ...],
+    ) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        return None
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+        return None
+
+    def cumulative_counts(self) -> list[int]:
+        results = list()
+        total = 0
+        for bucket_count in self.counts:
+            total += bucket_count
+            results.append(total)
+        return results
+
+
+class PoolMetrics:
+    def __init__(
+            self,
+            logger: Logger | None = None,
+            slow_query_threshold_in_seconds: float = 0,
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS_IN_SECONDS,
+    ) -> None:
+        self.logger = logger
+        self.slow_query_threshold_in_seconds = slow_query_threshold_in_seconds
+        self.buckets = buckets
+
+        self.histograms: dict[tuple[str, str, str], Histogram] = dict()
+        self.pools: dict[str, Pool] = dict()
+        return None
+
+    def register_pool(
+            self,
+            name: str,
+            pool: Pool,
+    ) -> None:
+        self.pools[name] = pool
+        return None
+
+    def observe(
+            self,
+            metric_name: str,
+            table_name: str,
+            operation: str,
+            seconds: float,
+    ) -> None:
+        key = (metric_name, table_name, operation)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(buckets=self.buckets)
+
+        histogram.observe(seconds)
+        return None
+
+    def observe_acquire_wait(
+            self,
+            table_name: str,
+            operation: str,
+            seconds: float,
+    ) -> None:
+        return self.observe(
+            metric_name=ACQUIRE_WAIT_METRIC_NAME,
+            table_name=table_name,
+            operation=operation,
+            seconds=seconds,
+        )
+
+    def observe_execution(
+            self,
+            table_name: str,
+            operation: str,
+            query: str,
+            seconds: float,
+    ) -> None:
+        self.observe(
+            metric_name=EXECUTION_METRIC_NAME,
+            table_name=table_name,
+            operation=operation,
+            seconds=seconds,
+        )
+
+        if (
+            self.logger
+            and self.slow_query_threshold_in_seconds
+            and seconds >= self.slow_query_threshold_in_seconds
+        ):
+            self.logger.warning(
+                "Slow query on %s (%s) took %.3f seconds: %s",
+                table_name,
+                operation,
+                seconds,
+                " ".join(query.split()),
+            )
+
+        return None
+
+    def render_prometheus(self) -> str:
+        lines = list()
+
+        for metric_name, help_text in METRICS_HELP.items():
+            lines.append(f"# HELP {metric_name} {help_text}")
+            lines.append(f"# TYPE {metric_name} histogram")
+            for (name, table_name, operation), histogram in sorted(self.histograms.items()):
+                if name != metric_name:
+                    continue
+
+                labels = f'table="{table_name}",operation="{operation}"'
+                for bucket, cumulative_count in zip(
+                    histogram.buckets,
+                    histogram.cumulative_counts(),
+                ):
+                    lines.append(f'{metric_name}_bucket{{{labels},le="{bucket}"}} {cumulative_count}')
+                lines.append(f'{metric_name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric_name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{metric_name}_count{{{labels}}} {histogram.count}")
+
+        for metric_name, help_text, read_value in (
+            ("db_pool_size", "Open connections in the pool.", lambda pool: pool.get_size()),
+            ("db_pool_idle", "Idle connections in the pool.", lambda pool: pool.get_idle_size()),
+            ("db_pool_busy", "Checked-out connections in the pool.", lambda pool: pool.get_size() - pool.get_idle_size()),
+            ("db_pool_max_size", "Maximum connections of the pool.", lambda pool: pool.get_max_size()),
+        ):
+            lines.append(f"# HELP {metric_name} {help_text}")
+            lines.append(f"# TYPE {metric_name} gauge")
+            for pool_name, pool in sorted(self.pools.items()):
+                lines.append(f'{metric_name}{{pool="{pool_name}"}} {read_value(pool)}')
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Hashable,
+)
+
+
+class QueryCache:
+    def __init__(
+            self,
+            maximum_size: int = 256,
+    ) -> None:
+        self.maximum_size = maximum_size
+        self.hits = 0
+        self.misses = 0
+
+        self.queries: OrderedDict[Hashable, str] = OrderedDict()
+        return None
+
+    def get_or_build(
+            self,
+            key: Hashable,
+            builder: Callable[[], str],
+    ) -> str:
+        query = self.queries.get(key)
+        if query is not None:
+            self.queries.move_to_end(key)
+            self.hits += 1
+            return query
+
+        self.misses += 1
+        query = builder()
+        if self.maximum_size:
+            self.queries[key] = query
+            if len(self.queries) > self.maximum_size:
+                self.queries.popitem(last=False)
+
+        return query
+
+    def info(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.queries),
+            "maximum_size": self.maximum_size,
+        }
+
+    def clear(self) -> None:
+        self.queries.clear()
+        self.hits = 0
+        self.misses = 0
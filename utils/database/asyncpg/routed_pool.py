@@ -0,0 +1,44 @@
+from itertools import count
+
+from asyncpg import Pool
+
+from ..constant import EnumReplicaSelection
+
+
+class RoutedPool:
+    def __init__(
+            self,
+            primary: Pool,
+            replicas: list[Pool],
+            replica_selection: EnumReplicaSelection = EnumReplicaSelection.ROUND_ROBIN,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.replica_selection = replica_selection
+
+        self._counter = count()
+        return None
+
+    def acquire(self, *args, **kwargs):
+        return self.primary.acquire(*args, **kwargs)
+
+    async def release(self, *args, **kwargs) -> None:
+        return await self.primary.release(*args, **kwargs)
+
+    def for_read(self) -> Pool:
+        if not self.replicas:
+            return self.primary
+
+        if self.replica_selection == EnumReplicaSelection.LEAST_BUSY:
+            return min(
+                self.replicas,
+                key=lambda pool: pool.get_size() - pool.get_idle_size(),
+            )
+
+        return self.replicas[next(self._counter) % len(self.replicas)]
+
+    async def close(self) -> None:
+        for pool in (self.primary, *self.replicas):
+            await pool.close()
+
+        return None
@@ -0,0 +1,275 @@
+from hashlib import sha256
+from json import (
+    dumps,
+    loads,
+)
+from os import replace
+from pathlib import Path
+from typing import Any
+
+from asyncpg import Pool
+
+from .db_action import DbAction
+
+# Columns, types and enum labels of a whole schema in one round trip. data_type
+# follows information_schema.columns, so the filters callers already pass to
+# get_columns_by_type (e.g. "timestamp with time zone") keep matching.
+SCHEMA_CATALOG_QUERY = """
+SELECT json_build_object(
+    'columns', COALESCE((
+        SELECT json_agg(
+            json_build_object(
+                'schema_name', n.nspname,
+                'table_name', c.relname,
+                'column_name', a.attname,
+                'data_type', CASE
+                    WHEN bt.typcategory = 'A' THEN 'ARRAY'
+                    WHEN bt.typtype IN ('e', 'c') OR bt.typnamespace <> 'pg_catalog'::regnamespace THEN 'USER-DEFINED'
+                    ELSE format_type(bt.oid, NULL)
+                END,
+                'udt_name', bt.typname,
+                'column_type', format_type(a.atttypid, a.atttypmod)
+            )
+            ORDER BY n.nspname, c.relname, a.attnum
+        )
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.oid
+        JOIN pg_type t ON t.oid = a.atttypid
+        JOIN pg_type bt ON bt.oid = CASE WHEN t.typtype = 'd' THEN t.typbasetype ELSE t.oid END
+        WHERE n.nspname = {schema_name}
+            AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+    ), '[]'::json),
+    'enums', COALESCE((
+        SELECT json_object_agg(enums.typname, enums.labels)
+        FROM (
+            SELECT t.typname, json_agg(e.enumlabel ORDER BY e.enumsortorder) AS labels
+            FROM pg_type t
+            JOIN pg_namespace n ON n.oid = t.typnamespace
+            JOIN pg_enum e ON e.enumtypid = t.oid
+            WHERE n.nspname = {schema_name}
+            GROUP BY t.typname
+        ) AS enums
+    ), '{{}}'::json)
+) AS catalog;"""
+
+SCHEMA_CATALOG_CACHE_VERSION = 2
+
+
+def compute_migration_hash(sqls: dict[str, list[str]]) -> str:
+    hasher = sha256()
+    for script_name in sorted(sqls):
+        hasher.update(script_name.encode("utf-8"))
+        for sql in sqls[script_name]:
+            hasher.update(b"\0")
+            hasher.update(sql.encode("utf-8"))
+        hasher.update(b"\1")
+    return hasher.hexdigest()
+
+
+class SchemaCatalog:
+    def __init__(
+            self,
+            columns: list[dict[str, str]],
+            enums: dict[str, list[str]],
+    ) -> None:
+        self.columns = columns
+        self.enums = enums
+
+        # Tables are keyed by "schema.table"; a bare table name resolves
+        # through table_names_by_name as long as only one schema has it.
+        self.tables: dict[str, dict[str, dict[str, str]]] = dict()
+        self.table_names_by_name: dict[str, set[str]] = dict()
+        for column in columns:
+            qualified_name = f"{column['schema_name']}.{column['table_name']}"
+            self.tables.setdefault(qualified_name, dict())[column["column_name"]] = column
+            self.table_names_by_name.setdefault(column["table_name"], set()).add(qualified_name)
+
+        return None
+
+    @classmethod
+    def from_dict(cls, catalog: dict[str, Any]) -> "SchemaCatalog":
+        return cls(
+            columns=catalog["columns"],
+            enums=catalog["enums"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "columns": self.columns,
+            "enums": self.enums,
+        }
+
+    @classmethod
+    async def load(
+            cls,
+            postgresql_connection_pool: Pool,
+            schema_name: str = "public",
+            cache_path: Path | str | None = None,
+            migration_hash: str | None = None,
+    ) -> "SchemaCatalog":
+        schema_catalog = cls._load_from_disk(
+            cache_path=cache_path,
+            schema_name=schema_name,
+            migration_hash=migration_hash,
+        )
+        if schema_catalog:
+            return schema_catalog
+
+        async with postgresql_connection_pool.acquire() as connection:
+            catalog = await connection.fetchval(
+                SCHEMA_CATALOG_QUERY.format(schema_name="$1"),
+                schema_name,
+            )
+
+        return cls._create_and_save(
+            catalog=catalog,
+            cache_path=cache_path,
+            schema_name=schema_name,
+            migration_hash=migration_hash,
+        )
+
+    @classmethod
+    def load_sync(
+            cls,
+            connection,
+            schema_name: str = "public",
+            cache_path: Path | str | None = None,
+            migration_hash: str | None = None,
+    ) -> "SchemaCatalog":
+        schema_catalog = cls._load_from_disk(
+            cache_path=cache_path,
+            schema_name=schema_name,
+            migration_hash=migration_hash,
+        )
+        if schema_catalog:
+            return schema_catalog
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SCHEMA_CATALOG_QUERY.format(schema_name="%(schema_name)s"),
+                {"schema_name": schema_name},
+            )
+            catalog = cursor.fetchone()[0]
+
+        return cls._create_and_save(
+            catalog=catalog,
+            cache_path=cache_path,
+            schema_name=schema_name,
+            migration_hash=migration_hash,
+        )
+
+    @classmethod
+    def _load_from_disk(
+            cls,
+            cache_path: Path | str | None,
+            schema_name: str,
+            migration_hash: str | None,
+    ) -> "SchemaCatalog | None":
+        # Without a migration hash there is no way to tell a stale file apart.
+        if not cache_path or not migration_hash:
+            return None
+
+        try:
+            with open(cache_path, "r", encoding="utf-8") as handler:
+                cached = loads(handler.read())
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(cached, dict)
+            or cached.get("version") != SCHEMA_CATALOG_CACHE_VERSION
+            or cached.get("schema_name") != schema_name
+            or cached.get("migration_hash") != migration_hash
+        ):
+            return None
+
+        return cls.from_dict(cached["catalog"])
+
+    @classmethod
+    def _create_and_save(
+            cls,
+            catalog: str | dict[str, Any],
+            cache_path: Path | str | None,
+            schema_name: str,
+            migration_hash: str | None,
+    ) -> "SchemaCatalog":
+        # asyncpg hands json back as text, psycopg2 already decodes it.
+        if isinstance(catalog, str):
+            catalog = loads(catalog)
+
+        schema_catalog = cls.from_dict(catalog)
+
+        if cache_path and migration_hash:
+            cache_path = Path(cache_path)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = cache_path.with_name(f"{cache_path.name}.tmp")
+            with open(temporary_path, "w", encoding="utf-8") as handler:
+                handler.write(
+                    dumps(
+                        {
+                            "version": SCHEMA_CATALOG_CACHE_VERSION,
+                            "schema_name": schema_name,
+                            "migration_hash": migration_hash,
+                            "catalog": schema_catalog.to_dict(),
+                        }
+                    )
+                )
+            replace(temporary_path, cache_path)
+
+        return schema_catalog
+
+    def resolve_table_name(self, table_name: str) -> str:
+        if table_name in self.tables:
+            return table_name
+
+        qualified_names = self.table_names_by_name.get(table_name, set())
+        if len(qualified_names) == 1:
+            return next(iter(qualified_names))
+
+        if qualified_names:
+            raise ValueError(
+                f"Table '{table_name}' is ambiguous, use one of: {', '.join(sorted(qualified_names))}."
+            )
+        raise ValueError(f"Table '{table_name}' is not in the schema catalog.")
+
+    def get_table_columns(self, table_name: str) -> dict[str, dict[str, str]]:
+        return self.tables[self.resolve_table_name(table_name=table_name)]
+
+    def get_all_columns_names(self, table_name: str) -> set[str]:
+        return set(self.get_table_columns(table_name=table_name))
+
+    def get_columns_by_type(
+            self,
+            table_name: str,
+            types: set[str],
+    ) -> set[str]:
+        return {
+            column_name
+            for column_name, column in self.get_table_columns(table_name=table_name).items()
+            if column["data_type"] in types
+        }
+
+    def get_columns_types(self, table_name: str) -> dict[str, str]:
+        return {
+            column_name: column["column_type"]
+            for column_name, column in self.get_table_columns(table_name=table_name).items()
+        }
+
+    def get_enum_values(self, enum_name: str) -> set[str]:
+        return set(self.enums.get(enum_name, list()))
+
+    def create_db_action(
+            self,
+            table_name: str,
+            db_action_class: type[DbAction] = DbAction,
+            **kwargs,
+    ) -> DbAction:
+        return db_action_class(
+            table_name=table_name,
+            all_columns_names=self.get_all_columns_names(table_name=table_name),
+            columns_types=self.get_columns_types(table_name=table_name),
+            **kwargs,
+        )
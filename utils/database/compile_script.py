@@ -1,12 +1,29 @@
+from functools import partial
 from pathlib import Path
 
+from .script_bundle import load_script_bundle
+from .sql_statements import strip_sql_comments
+
+
+def strip_comment_lines(
+        content: str,
+        comment_start_with: str,
+) -> str:
+    cleaned_content = list()
+    for content_line in content.split("\n"):
+        if content_line and not content_line.startswith(comment_start_with):
+            cleaned_content.append(content_line)
+
+    return "\n".join(cleaned_content)
+
 
 def compile_script(
         this_file_path: Path | str,
         compiled_scripts: dict[str, list],
         extension_pattern: str = "*.sql",
         script_directory_name: str = "sql",
-        comment_start_with: str = "--"
+        comment_start_with: str = "--",
+        bundle_cache_path: Path | str | None = None,
 ) -> None:
 
     directory = Path(this_file_path).resolve(
@@ -14,20 +31,19 @@ def compile_script(
 
     files: list[Path] = list(directory.glob(extension_pattern))
 
-    for file in files:
-        with open(file, "r", encoding="utf-8") as handler:
-            content_lines = handler.readlines()
-
-        cleaned_content = list()
-        for content_line in content_lines: 
-            if not content_line.startswith(comment_start_with):
-                if content_line.endswith("\n"):
-                    content_line = content_line[:-1]
+    if comment_start_with == "--":
+        compile_content = strip_sql_comments
+    else:
+        compile_content = partial(strip_comment_lines, comment_start_with=comment_start_with)
 
-                if content_line:
-                    cleaned_content.append(content_line)
+    contents = load_script_bundle(
+        files=files,
+        compile_content=compile_content,
+        bundle_cache_path=bundle_cache_path,
+    )
 
-        cleaned_content_compiled = "\n".join(cleaned_content)
+    for file in files:
+        cleaned_content_compiled = contents[file]
         if cleaned_content_compiled:
             if file.stem in compiled_scripts:
                 compiled_scripts[file.stem].append(cleaned_content_compiled)
@@ -10,9 +10,29 @@ ORDER_BY_LITERAL = Literal[*sorted({i.value for i in EnumOrderBy})]
 
 
 class EnumDatetimeDuration(str, Enum):
+    HOURLY = "HOURLY"
     DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
     MONTHLY = "MONTHLY"
     YEARLY = "YEARLY"
+
+
+class EnumPaginationCountStrategy(str, Enum):
+    SEPARATE = "SEPARATE"  # ROWS, THEN COUNT(*), ONE AFTER ANOTHER
+    WINDOW = "WINDOW"  # ROWS AND COUNT(*) OVER() IN A SINGLE QUERY
+    CONCURRENT = "CONCURRENT"  # ROWS AND COUNT(*) CONCURRENTLY ON TWO CONNECTIONS
+    ESTIMATED = "ESTIMATED"  # ROWS, THEN A PLANNER ESTIMATE; EXACT COUNT(*) BELOW THE THRESHOLD
+
+
+class EnumReplicaSelection(str, Enum):
+    ROUND_ROBIN = "ROUND_ROBIN"
+    LEAST_BUSY = "LEAST_BUSY"  # FEWEST CONNECTIONS CURRENTLY CHECKED OUT
+
+
+class EnumSearchStrategy(str, Enum):
+    ILIKE = "ILIKE"  # ILIKE '%word%' PER WORD, NO INDEX SUPPORT
+    TRIGRAM = "TRIGRAM"  # SAME PREDICATES, SERVED BY A pg_trgm GIN INDEX
+    FULL_TEXT = "FULL_TEXT"  # to_tsvector @@ plainto_tsquery, SERVED BY A GIN INDEX
     
 
 MAP_ORDER_BY_SQL = {
@@ -27,7 +47,17 @@ MAP_ORDER_BY_MQL = {
 
 
 VALID_DURATIONS = {
+    "HOURLY": ("hour", 'YYYY-MM-DD HH24:00'),
     "DAILY": ("day", 'YYYY-MM-DD'),
+    "WEEKLY": ("week", 'IYYY-IW'),
     "MONTHLY": ("month", 'YYYY-MM'),
     "YEARLY": ("year", 'YYYY'),
+}
+
+VALID_DURATIONS_PYTHON_FORMAT = {
+    "HOURLY": "%Y-%m-%d %H:00",
+    "DAILY": "%Y-%m-%d",
+    "WEEKLY": "%G-%V",
+    "MONTHLY": "%Y-%m",
+    "YEARLY": "%Y",
 }
\ No newline at end of file
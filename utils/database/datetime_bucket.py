@@ -0,0 +1,99 @@
+from datetime import (
+    datetime,
+    timedelta,
+    UTC,
+)
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def truncate_datetime(
+        value: datetime,
+        trunc_value: str,
+) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    if trunc_value == "hour":
+        return value
+
+    value = value.replace(hour=0)
+    if trunc_value == "day":
+        return value
+
+    if trunc_value == "week":
+        return value - timedelta(days=value.weekday())
+
+    value = value.replace(day=1)
+    if trunc_value == "month":
+        return value
+
+    return value.replace(month=1)
+
+
+def next_datetime_bucket(
+        value: datetime,
+        trunc_value: str,
+) -> datetime:
+    if trunc_value == "hour":
+        return value + timedelta(hours=1)
+
+    if trunc_value == "day":
+        return value + timedelta(days=1)
+
+    if trunc_value == "week":
+        return value + timedelta(weeks=1)
+
+    if trunc_value == "month":
+        return value.replace(
+            year=value.year + value.month // 12,
+            month=value.month % 12 + 1,
+        )
+
+    return value.replace(year=value.year + 1)
+
+
+def fill_datetime_buckets(
+        counts: dict[datetime, int],
+        trunc_value: str,
+        date_format: str,
+        from_datetime: datetime | None = None,
+        to_datetime: datetime | None = None,
+) -> list[dict[str, str | int]]:
+    if from_datetime is not None:
+        start = truncate_datetime(
+            value=to_naive_utc(from_datetime),
+            trunc_value=trunc_value,
+        )
+    elif counts:
+        start = min(counts)
+    else:
+        return list()
+
+    # `to_datetime` is exclusive, so its own bucket only counts when it is
+    # not exactly on a bucket boundary.
+    if to_datetime is not None:
+        end = truncate_datetime(
+            value=to_naive_utc(to_datetime) - timedelta(microseconds=1),
+            trunc_value=trunc_value,
+        )
+    elif counts:
+        end = max(counts)
+    else:
+        end = start
+
+    results = list()
+    bucket = start
+    while bucket <= end:
+        results.append({
+            "datetime": bucket.strftime(date_format),
+            "count": counts.get(bucket, 0),
+        })
+        bucket = next_datetime_bucket(
+            value=bucket,
+            trunc_value=trunc_value,
+        )
+
+    return results
@@ -1,7 +1,12 @@
+from functools import partial
 from pathlib import Path
 from typing import Literal
 from logging import Logger
 
+from .compile_script import strip_comment_lines
+from .script_bundle import load_script_bundle
+from .sql_statements import strip_sql_comments
+
 
 def load_database_scripts_and_add(
         this_file_path: Path | str,
@@ -9,30 +14,33 @@ def load_database_scripts_and_add(
         logger: Logger,
         extension: Literal["sql", "mql"] = "sql",
         script_directory_name: str = "sql",
+        bundle_cache_path: Path | str | None = None,
 ) -> None:
 
-    for key, value in sqls.items():
+    paths = dict()
+    for key in sqls:
         path = Path(this_file_path).resolve(
         ).parents[0] / script_directory_name / f"{key}.{extension}"
 
         if not path.exists():
             logger.info("Path is not exist to load: %s", str(path))
             continue
-            
-        with open(path, "r", encoding="utf-8") as handler:
-            sql_lines = handler.readlines()
 
-        sqls = list()
-        for sql_line in sql_lines: 
-            if not sql_line.startswith("--"):
-                if sql_line.endswith("\n"):
-                    sql_line = sql_line[:-1]
+        paths[key] = path
 
-                if sql_line:
-                    sqls.append(sql_line)
+    if extension == "sql":
+        compile_content = strip_sql_comments
+    else:
+        compile_content = partial(strip_comment_lines, comment_start_with="--")
 
+    contents = load_script_bundle(
+        files=list(paths.values()),
+        compile_content=compile_content,
+        bundle_cache_path=bundle_cache_path,
+    )
 
-        if sqls:
-            value.extend(sqls)
+    for key, path in paths.items():
+        if contents[path]:
+            sqls[key].extend(contents[path].split("\n"))
 
     return None
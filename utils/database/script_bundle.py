@@ -0,0 +1,111 @@
+from hashlib import sha256
+from json import (
+    dumps,
+    loads,
+)
+from os import (
+    getpid,
+    replace,
+)
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+SCRIPT_BUNDLE_VERSION = 2
+
+
+def describe_compile_content(compile_content: Callable[[str], str]) -> str:
+    # Identifies how the bundle was compiled: switching the compile function
+    # or its arguments must not serve content produced by another one.
+    if isinstance(compile_content, partial):
+        return (
+            f"{describe_compile_content(compile_content.func)}"
+            f"{compile_content.args!r}{sorted(compile_content.keywords.items())!r}"
+        )
+    return f"{compile_content.__module__}.{compile_content.__qualname__}"
+
+
+def load_script_bundle(
+        files: list[Path],
+        compile_content: Callable[[str], str],
+        bundle_cache_path: Path | str | None = None,
+) -> dict[Path, str]:
+    # Compiles every file once and remembers the result in a JSON bundle. A
+    # file whose mtime and size are unchanged is served from the bundle
+    # without being opened; a touched file is re-read, but only recompiled
+    # when its content hash differs.
+    if not bundle_cache_path:
+        results = dict()
+        for file in files:
+            with open(file, "r", encoding="utf-8") as handler:
+                results[file] = compile_content(handler.read())
+        return results
+
+    bundle_cache_path = Path(bundle_cache_path)
+    compile_key = describe_compile_content(compile_content)
+    try:
+        with open(bundle_cache_path, "r", encoding="utf-8") as handler:
+            bundle = loads(handler.read())
+        if (
+            bundle.get("version") != SCRIPT_BUNDLE_VERSION
+            or bundle.get("compile_key") != compile_key
+        ):
+            bundle = None
+    except (OSError, ValueError, AttributeError):
+        bundle = None
+
+    cached_entries = bundle["files"] if bundle else dict()
+    entries = dict()
+    results = dict()
+    is_changed = len(cached_entries) != len(files)
+
+    for file in files:
+        key = str(file.resolve())
+        stat = file.stat()
+        entry = cached_entries.get(key)
+
+        if not (
+            entry
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            with open(file, "rb") as handler:
+                raw = handler.read()
+            content_hash = sha256(raw).hexdigest()
+
+            if not entry or entry["sha256"] != content_hash:
+                entry = {
+                    "sha256": content_hash,
+                    "content": compile_content(raw.decode("utf-8")),
+                }
+
+            entry = {
+                **entry,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+            is_changed = True
+
+        entries[key] = entry
+        results[file] = entry["content"]
+
+    if is_changed:
+        try:
+            bundle_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = bundle_cache_path.with_name(f"{bundle_cache_path.name}.{getpid()}.tmp")
+            with open(temporary_path, "w", encoding="utf-8") as handler:
+                handler.write(
+                    dumps(
+                        {
+                            "version": SCRIPT_BUNDLE_VERSION,
+                            "compile_key": compile_key,
+                            "files": entries,
+                        }
+                    )
+                )
+            replace(temporary_path, bundle_cache_path)
+        except OSError:
+            # A read-only install still works, it just compiles every time.
+            pass
+
+    return results
@@ -0,0 +1,142 @@
+from re import compile
+
+DOLLAR_QUOTE_TAG_PATTERN = compile(r"\$[A-Za-z_][A-Za-z_0-9]*\$|\$\$")
+
+
+def split_sql_statements(script: str) -> list[str]:
+    # Splits on top-level semicolons only: quoted strings, quoted identifiers,
+    # comments and dollar-quoted bodies (functions, DO blocks) are kept whole.
+    statements = list()
+    start = 0
+    index = 0
+    length = len(script)
+
+    while index < length:
+        end = _skip_quoted(script=script, index=index)
+        if end != index:
+            index = end
+            continue
+
+        if script.startswith("--", index):
+            index = script.find("\n", index)
+            index = length if index == -1 else index + 1
+            continue
+
+        if script.startswith("/*", index):
+            index = script.find("*/", index + 2)
+            index = length if index == -1 else index + 2
+            continue
+
+        if script[index] == ";":
+            _append_statement(statements=statements, statement=script[start:index])
+            start = index + 1
+
+        index += 1
+
+    _append_statement(statements=statements, statement=script[start:])
+
+    return statements
+
+
+def _append_statement(
+        statements: list[str],
+        statement: str,
+) -> None:
+    # Empty fragments (`;;`) and comment-only ones are not statements.
+    statement = statement.strip()
+    if statement and strip_sql_comments(statement):
+        statements.append(f"{statement};")
+    return None
+
+
+def _skip_quoted(
+        script: str,
+        index: int,
+) -> int:
+    # Returns the index just past the quoted string, identifier or
+    # dollar-quoted body starting at `index`, or `index` if none starts there.
+    character = script[index]
+
+    # E'...' strings take backslash escapes, so \' does not end them.
+    if (
+        character == "'"
+        and index
+        and script[index - 1] in ("E", "e")
+        and not (index > 1 and (script[index - 2].isalnum() or script[index - 2] == "_"))
+    ):
+        index += 1
+        while index < len(script):
+            if script[index] == "\\":
+                index += 2
+            elif script.startswith("''", index):
+                index += 2
+            elif script[index] == "'":
+                return index + 1
+            else:
+                index += 1
+        return len(script)
+
+    if character in ("'", '"'):
+        index = script.find(character, index + 1)
+        while index != -1 and script.startswith(character, index + 1):
+            index = script.find(character, index + 2)
+        return len(script) if index == -1 else index + 1
+
+    if character == "$":
+        match = DOLLAR_QUOTE_TAG_PATTERN.match(script, index)
+        if match:
+            index = script.find(match.group(), match.end())
+            return len(script) if index == -1 else index + len(match.group())
+
+    return index
+
+
+def strip_sql_comments(script: str) -> str:
+    # Removes `--` and (nested) `/* */` comments wherever they appear, leaving
+    # anything inside quotes or dollar-quoted bodies untouched, then drops the
+    # lines left blank.
+    parts = list()
+    start = 0
+    index = 0
+    length = len(script)
+
+    while index < length:
+        end = _skip_quoted(script=script, index=index)
+        if end != index:
+            index = end
+            continue
+
+        if script.startswith("--", index):
+            parts.append(script[start:index])
+            index = script.find("\n", index)
+            index = start = length if index == -1 else index
+            continue
+
+        if script.startswith("/*", index):
+            parts.append(script[start:index])
+            depth = 0
+            while index < length:
+                if script.startswith("/*", index):
+                    depth += 1
+                    index += 2
+                elif script.startswith("*/", index):
+                    depth -= 1
+                    index += 2
+                    if not depth:
+                        break
+                else:
+                    index += 1
+            # Keep the tokens on either side of the comment apart.
+            parts.append(" ")
+            start = index
+            continue
+
+        index += 1
+
+    parts.append(script[start:])
+
+    return "\n".join(
+        line.rstrip()
+        for line in "".join(parts).splitlines()
+        if line.strip()
+    )
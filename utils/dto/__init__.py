@@ -3,6 +3,8 @@ from .response_schema import (
     ResponseSchema,
     PaginatedSchema,
     PaginatedDataSchema,
+    KeysetPaginatedSchema,
+    KeysetPaginatedDataSchema,
 )
 from .update_partially_request import ModelUpdatePartiallyRequestValidation
 from .delete_by_id_response import ModelDeleteByIdResponseWithSchema
@@ -14,8 +14,20 @@ class PaginatedSchema(BaseModel):
     current_page: int = 1
     page_size: int = 1000
     total: int
+    total_is_estimated: bool = False
 
 
 class PaginatedDataSchema(BaseModel):
     pagination: PaginatedSchema
     # data: list = list()  # Should be overridden
+
+
+class KeysetPaginatedSchema(BaseModel):
+    page_size: int = 1000
+    cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+
+
+class KeysetPaginatedDataSchema(BaseModel):
+    pagination: KeysetPaginatedSchema
+    # data: list = list()  # Should be overridden
@@ -1,6 +1,7 @@
 from typing import (
     Annotated,
     Dict,
+    Optional,
 )
 
 from fastapi import Query
@@ -25,7 +26,11 @@ def prepare_page_and_order_by_builder(
             str,
             Query(description='Sort order. Use comma-separated fields. Prefix with "-" for descending. e.g., "-created_at,name"'),
         ] = default_order_by,
-    ) -> dict[str, int | dict[str, ORDER_BY_LITERAL]]:
+        cursor: Annotated[
+            Optional[str],
+            Query(description='Opaque cursor from the previous page\'s "next_cursor". Replaces "current_page" with keyset pagination.'),
+        ] = None,
+    ) -> dict[str, int | str | None | dict[str, ORDER_BY_LITERAL]]:
 
         parsed_order_by: Dict[str, ORDER_BY_LITERAL] = {}
 
@@ -46,6 +51,7 @@ def prepare_page_and_order_by_builder(
                 for k
                 in parsed_order_by.keys() & allowed_keys
             },
+            "cursor": cursor,
         }
 
     return prepare_page_and_order_by
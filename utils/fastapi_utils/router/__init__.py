@@ -1,4 +1,5 @@
 from .convert_module_name_to_route_name import convert_module_name_to_route_name
 from .project_orjson_response import ProjectOrjsonResponse
 from .prepare_inclusion import prepare_inclusion
-from .build_documents_router import build_documents_router
\ No newline at end of file
+from .build_documents_router import build_documents_router
+from .build_metrics_router import build_metrics_router
\ No newline at end of file
@@ -0,0 +1,32 @@
+from fastapi import (
+    APIRouter,
+    params,
+)
+from fastapi.responses import PlainTextResponse
+
+from ...database.asyncpg.pool_metrics import PoolMetrics
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def build_metrics_router(
+    pool_metrics: PoolMetrics,
+    path: str = "/metrics",
+    dependencies: list[params.Depends] = list(),
+) -> APIRouter:
+
+    router = APIRouter(include_in_schema=False)
+
+    @router.get(
+        path=path,
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+        dependencies=dependencies,
+    )
+    async def get_metrics():
+        return PlainTextResponse(
+            content=pool_metrics.render_prometheus(),
+            media_type=PROMETHEUS_MEDIA_TYPE,
+        )
+
+    return router
@@ -1,6 +1,7 @@
 from traceback import format_exc
 from typing import Callable
 from logging import Logger
+from uuid import UUID
 
 from asyncpg import Pool
 
@@ -10,7 +11,8 @@ from utils.dto import (
     ModelDeleteBulkRequest,
 )
 from utils.database.asyncpg import DbAction
-from .delete_by_pid_core import delete_by_pid_core as _delete_by_pid_core
+
+INTEGER_PID_TYPES = {"smallint", "integer", "bigint"}
 
 
 async def delete_bulk(
@@ -18,7 +20,97 @@ async def delete_bulk(
         postgresql_connection_pool: Pool,
         db_action: DbAction,
         logger: Logger,
-        delete_by_pid_core: Callable = _delete_by_pid_core,
+        delete_by_pid_core: Callable | None = None,
+):
+    if delete_by_pid_core is not None:
+        return await _delete_bulk_one_by_one(
+            model=model,
+            postgresql_connection_pool=postgresql_connection_pool,
+            db_action=db_action,
+            logger=logger,
+            delete_by_pid_core=delete_by_pid_core,
+        )
+
+    # asyncpg encodes pids with the column's codec, so they are cast to its
+    # type first; a pid that does not cast cannot exist and would otherwise
+    # fail the whole batch. Results are matched on the cast value, since
+    # Postgres returns uuids in canonical form. Without a known type, pids
+    # are sent as given and those that parse as uuids are matched as uuids.
+    pid_type = db_action.columns_types.get("pid")
+    cast_pids = {pid: _cast_pid(pid=pid, pid_type=pid_type) for pid in model.pids}
+
+    try:
+        deleted_pids = await db_action.delete_many_by_pids(
+            pids=[pid for pid in cast_pids.values() if pid is not None],
+            postgresql_connection_pool=postgresql_connection_pool,
+        )
+    except Exception:
+        logger.warning(format_exc())
+        return {
+            pid: ModelDeleteBulkResponse(
+                success=False,
+                error="There is a problem!",
+            )
+            for pid in model.pids
+        }
+
+    deleted_keys = {
+        _match_key(pid=_cast_pid(pid=pid, pid_type=pid_type), pid_type=pid_type)
+        for pid in deleted_pids
+    }
+    results = dict()
+    for pid, cast_pid in cast_pids.items():
+        if cast_pid is not None and _match_key(pid=cast_pid, pid_type=pid_type) in deleted_keys:
+            results[pid] = ModelDeleteBulkResponse(
+                success=True,
+                error=None,
+            )
+        else:
+            results[pid] = ModelDeleteBulkResponse(
+                success=False,
+                error="Item is not exist.",
+            )
+
+    return results
+
+
+def _cast_pid(
+        pid: str,
+        pid_type: str | None,
+) -> str | int | UUID | None:
+    try:
+        if pid_type in INTEGER_PID_TYPES:
+            return int(pid)
+        if pid_type == "uuid":
+            return UUID(str(pid))
+    except ValueError:
+        return None
+    return pid
+
+
+def _match_key(
+        pid: str | int | UUID,
+        pid_type: str | None,
+) -> str:
+    if pid_type is None and _looks_like_uuid(pid):
+        return str(UUID(str(pid)))
+    return str(pid)
+
+
+def _looks_like_uuid(pid: str) -> bool:
+    try:
+        UUID(str(pid))
+    except ValueError:
+        return False
+    return True
+
+
+async def _delete_bulk_one_by_one(
+        model: ModelDeleteBulkRequest,
+        postgresql_connection_pool: Pool,
+        db_action: DbAction,
+        logger: Logger,
+        delete_by_pid_core: Callable,
 ):
     results = dict()
     for pid in model.pids:
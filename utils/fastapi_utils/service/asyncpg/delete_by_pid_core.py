@@ -8,11 +8,10 @@ async def delete_by_pid_core(
         postgresql_connection_pool: Pool,
         db_action: DbAction,
 ) -> None:
-    await db_action.is_exist_or_raise(
+    await db_action.delete_or_raise(
         where_clause="pid = $1",
         values=(pid,),
         postgresql_connection_pool=postgresql_connection_pool,
-        raise_on_absence=True,
         exception_input={
             "status_code": 404,
             "success": False,
@@ -21,10 +20,4 @@ async def delete_by_pid_core(
         },
     )
 
-    await db_action.delete(
-        where_clause="pid = $1",
-        values=(pid,),
-        postgresql_connection_pool=postgresql_connection_pool,
-    )
-
     return None
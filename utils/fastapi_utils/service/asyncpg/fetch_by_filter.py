@@ -4,6 +4,7 @@ from asyncpg import Pool
 from pydantic import BaseModel
 
 from utils.database.asyncpg import DbAction
+from utils.database.asyncpg.estimated_count import EstimatedCount
 
 
 async def fetch_by_filter(
@@ -14,7 +15,27 @@ async def fetch_by_filter(
     db_action: DbAction,
     response_model: Type[BaseModel],
     kwargs: dict,
+    cursor: str | None = None,
+    keyset_pagination: bool = False,
 ) -> dict:
+    if keyset_pagination or cursor:
+        records, next_cursor = await db_action.keyset_fetch_by_filter(
+            postgresql_connection_pool=postgresql_connection_pool,
+            returning_fields=inclusion,
+            page_size=page_size,
+            cursor=cursor,
+            kwargs=kwargs,
+        )
+
+        return {
+            "pagination": {
+                "page_size": page_size,
+                "cursor": cursor,
+                "next_cursor": next_cursor,
+            },
+            "data": [response_model(**record).model_dump(include=inclusion) for record in records]
+        }
+
     records, total = await db_action.paginated_fetch_by_filter(
         postgresql_connection_pool=postgresql_connection_pool,
         returning_fields=inclusion,
@@ -28,6 +49,7 @@ async def fetch_by_filter(
             "current_page": current_page,
             "page_size": page_size,
             "total": total,
+            "total_is_estimated": isinstance(total, EstimatedCount),
         },
         "data": [response_model(**record).model_dump(include=inclusion) for record in records]
     }
@@ -13,11 +13,11 @@ async def fetch_by_pid(
     db_action: DbAction,
     response_model: Type[BaseModel],
 ) -> dict:
-    await db_action.is_exist_or_raise(
+    record = await db_action.fetch_or_raise(
         where_clause="pid = $1",
         values=(pid,),
         postgresql_connection_pool=postgresql_connection_pool,
-        raise_on_absence=True,
+        returning_fields=inclusion,
         exception_input={
             "status_code": 404,
             "success": False,
@@ -26,14 +26,4 @@ async def fetch_by_pid(
         },
     )
 
-    record = await db_action.fetch(
-        where_clause="pid = $1",
-        values=(pid,),
-        postgresql_connection_pool=postgresql_connection_pool,
-        returning_fields=inclusion,
-    )
-
-    if record:
-        return response_model(**record).model_dump(include=inclusion)
-    else:
-        return dict()
+    return response_model(**record).model_dump(include=inclusion)
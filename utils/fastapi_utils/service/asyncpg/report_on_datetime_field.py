@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import (
     Type,
 )
@@ -15,11 +16,15 @@ async def report_on_datetime_field(
     field_name: str,  # type: ignore
     response_model: Type[BaseModel],
     db_action: DbAction,
+    from_datetime: datetime | None = None,
+    to_datetime: datetime | None = None,
 ) -> dict:
     records = await db_action.fetch_report_on_datetime_fields(
         postgresql_connection_pool=postgresql_connection_pool,
         duration=duration,
-        field_name=field_name
+        field_name=field_name,
+        from_datetime=from_datetime,
+        to_datetime=to_datetime,
     )
 
     return response_model(data=[{**record} for record in records]).model_dump()